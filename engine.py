@@ -2,12 +2,28 @@ from objects.ray import Ray
 from objects.line import Line
 from objects.vector import Vector
 from objects.point import Point
+from objects.batch import RayBatch, trace, stream
+from objects.sources import image_sources
+from objects.beams import beam_tree, heard
+from objects.trajectory import Trajectory
+import objects.rir as rir
+from objects.adaptive import AdaptiveSweep
+from objects.receivers import ReceiverGrid
+from objects.distances import EDM, pair_groups, labelled
+from objects.render import render
+from objects.scenarios import Scenario, run
+from objects.room import Room
+from matplotlib.figure import Figure
 import objects.dataset as sets
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
 import objects.analytics as analysis
+import objects.stats as stats
 import math
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 
 
@@ -19,14 +35,17 @@ class Engine:
         self.walls = []
         self.sender = None
         self.reciever = Point([0.,0.])
+        self.recievers = [] # optional microphone array, see multi_sound_events.
         self.radius = 0.0125 # Important HYPERPARAMETER, represents the buffer for floats.
         self.rays = []
         self.images = []
+        self.heard = [] # image points for each of self.recievers, like self.images.
+        self.beams = [] # the tree of beam_sound_events.
         self.edm = []
         self.distance_pairs = {}
 
     
-    def generate(self):
+    def generate(self, polygon: bool = False):
         """
         Docstring for generate
         
@@ -35,6 +54,9 @@ class Engine:
         120° = 2pi/3 and 30° = pi/6
         150° and 60° is also possible, just less then 90° difference, else the triangle gets to large
         :param self: Description
+        :param polygon: The walls as a closed Room (the triangle between the lines) instead of infinite lines.
+        The triangle is convex, so the rays find the next wall with half-plane tests.
+        :type polygon: bool
         """
         rng = np.random.default_rng()
         # generate the angular range
@@ -65,6 +87,8 @@ class Engine:
             flag = False
         
         self.sender = Point([-3.123, 19.543])
+        if polygon:
+            self.walls = Room.from_lines(self.walls)
         # think of some bounds: how far from each other? how far from each wall at least?
 
 
@@ -82,69 +106,370 @@ class Engine:
 
 
         # compute all the rays, with each having a unique outgoing angle of the sender.
-        for x in range(ROUNDS):
-            ray = Ray(Vector(self.sender, Point([self.sender.value[0] + np.cos((2 * np.pi)* (x/ROUNDS)), self.sender.value[1] + np.sin((2* np.pi)* (x/ROUNDS))])), max_order)
+        with stats.stage("trace"):
+            for x in range(ROUNDS):
+                ray = Ray(Vector(self.sender, Point([self.sender.value[0] + np.cos((2 * np.pi)* (x/ROUNDS)), self.sender.value[1] + np.sin((2* np.pi)* (x/ROUNDS))])), max_order)
             
-            # expend every ray and add it to the ray collection.
-            ray.expand(self.walls, (self.reciever, self.radius) , False)
-            self.rays.append(ray)
+                # expend every ray and add it to the ray collection.
+                ray.expand(self.walls, (self.reciever, self.radius) , False)
+                self.rays.append(ray)
         
 
-        # plot all the recieved points (only recieved, because else its just a black mess).
-        for r in self.rays:
-            if r.recieved:
-                r.plot()
-                
-                # only take image points once, many are multile, because of rounding buffer.
-                img = r.pov((self.reciever, self.radius))
-                add = True
-                for e in self.images:
-                    if img[1] == e[1]:
-                        add = False
-                        break
+        with stats.stage("images"):
+            # plot all the recieved points (only recieved, because else its just a black mess).
+            for r in self.rays:
+                if r.recieved:
+                    if show:
+                        r.plot()
                 
-                if add:
-                    self.images.append(img)
+                    # only take image points once, many are multile, because of rounding buffer.
+                    img = r.pov((self.reciever, self.radius), plotting=show)
+                    add = True
+                    for e in self.images:
+                        if img[1] == e[1]:
+                            add = False
+                            break
                 
+                    if add:
+                        self.images.append(img)
 
-                r.expanded = False
-                r.recieved = False
-                r.value = r.values[0]
-                r.values = []
-                r.expand(self.walls, (self.reciever, self.radius) , True)
+                    # the path is already in r.values, so there is no need to trace it again.
 
         # plot the walls and their reflection behaviour if desired.
+        if show:
+            for w in self.walls:
+                w.plot()
+                if max_order >= 1:
+                    # w.create_circle(1)
+                    pass
+        
+            # plot the two points.
+            self.sender.plot()
+            self.reciever.plot("cyan")
+
+
+    def _add_images(self, images):
+        """
+        Adds the (position, label) pairs to self.images, every label only once.
+        The first one of a label stays, like in sound_events.
+        """
+        labels = {e[1] for e in self.images}
+        for img in images:
+            if not img[1] in labels:
+                self.images.append(img)
+                labels.add(img[1])
+
+
+    def _plot_rays(self):
+        """
+        The show flag of the sweeps with Ray objects: the recieved rays with their image points,
+        the walls, sender and reciever.
+        """
+        reciever = (self.reciever, self.radius)
+        for r in self.rays:
+            r.plot()
+            r.pov(reciever)
+
         for w in self.walls:
             w.plot()
-            if max_order >= 1:
-                # w.create_circle(1)
-                pass
-        
-        # plot the two points.
+
         self.sender.plot()
         self.reciever.plot("cyan")
 
 
-    def create_edm(self):
-        # initilize the entire edm
-        self.edm = [[None for _ in range(len(self.images) + 1)] for _ in range(len(self.images) + 1)]
+    def _plot_images(self):
+        """
+        The show flag of the methods without rays: the image points, walls, sender and reciever.
+        """
+        for pov, label in self.images:
+            pov.end.plot("orange", label)
 
-        # corner with no value
-        self.edm[0][0] = " "
+        for w in self.walls:
+            w.plot()
 
-        # add the labels to all the rows and columns
-        for index, pair in enumerate(self.images):
-            self.edm[0][index + 1] = pair[1]
-            self.edm[index + 1][0] = pair[1]
-        
-        row = 1
-        column = 1
-        while row < len(self.images) + 1:
-            while column < len(self.images) + 1:
-                self.edm[row][column] = abs(Vector(Point(self.images[row - 1][0].value), Point(self.images[column - 1][0].value)))
-                column += 1
-            column = 1
-            row += 1
+        self.sender.plot()
+        self.reciever.plot("cyan")
+
+
+    def batch_sound_events(self, max_order: int, show: bool = False, rounds: int = ROUNDS):
+        """
+        Same as sound_events, but all the rays are traced at once as numpy arrays (see objects/batch.py).
+        Gives the same image points, but only the recieved rays are kept in self.rays as Ray objects,
+        so a lot more rays are possible.
+
+        :param self: Positions and Rays, so the entire dataset.
+        :param max_order: The maximum order reflection. Only less iff recieved.
+        :param show: Add the recieved rays, walls, sender and reciever to the plot.
+        :param rounds: Amount of rays, which are send.
+        """
+        assert max_order >= 0
+        reciever = (self.reciever, self.radius)
+
+        # expand every ray one order at a time.
+        with stats.stage("batch trace"):
+            batch = RayBatch.sweep(self.sender, rounds, max_order)
+            batch.expand(self.walls, reciever)
+        stats.count("batch rays traced", rounds)
+        stats.count("batch reciever hits", int(batch.recieved.sum()))
+        stats.count("batch rays discarded", rounds - int(batch.recieved.sum()))
+
+        # only take image points once, many are multiple, because of rounding buffer.
+        with stats.stage("images"):
+            self._add_images(batch.images(reciever))
+
+        # single objects only for the recieved ones.
+        with stats.stage("recieved rays"):
+            self.rays += batch.rays(self.walls, reciever)
+
+        if show:
+            self._plot_rays()
+
+
+    def stream_sound_events(self, max_order: int, rounds: int = ROUNDS, chunk: int = 4096):
+        """
+        Streaming version of sound_events. Nothing is kept, neither in self.rays nor in self.images,
+        the recieved rays are handed out one by one as (angle index, label, path length, incoming direction),
+        so even millions of rays only need the memory of one chunk.
+
+        :param self: Positions, the walls, sender and reciever.
+        :param max_order: The maximum order reflection. Only less iff recieved.
+        :param rounds: Amount of rays, which are send.
+        :param chunk: Amount of rays traced at once.
+        """
+        assert max_order >= 0
+        yield from stream(self.walls, self.sender, (self.reciever, self.radius), max_order, rounds, chunk)
+
+
+    def multi_sound_events(self, max_order: int, show: bool = False, rounds: int = ROUNDS):
+        """
+        Sweep for many recievers at once, every ray is traced only once (see objects/receivers.py).
+        The recievers are sorted into a grid and each segment is only tested against the recievers near it.
+        Rays are not stopped by a reciever, so self.heard gets the image points of every reciever in
+        self.recievers, the same order as there.
+
+        :param self: Positions and Rays, so the entire dataset.
+        :param max_order: The maximum order reflection.
+        :param show: Add the image points, walls, sender and recievers to the plot.
+        :param rounds: Amount of rays, which are send.
+        """
+        assert max_order >= 0
+        grid = ReceiverGrid(self.recievers or [self.reciever], self.radius)
+
+        batch = RayBatch.sweep(self.sender, rounds, max_order)
+        batch.expand(self.walls, grid)
+        self.heard = batch.heard_images(grid)
+
+        if show:
+            for images in self.heard:
+                for pov, label in images:
+                    pov.end.plot("orange", label)
+
+            for w in self.walls:
+                w.plot()
+
+            self.sender.plot()
+            for r in grid.recievers:
+                r.plot("cyan")
+
+
+    def parallel_sound_events(self, max_order: int, show: bool = False, rounds: int = ROUNDS, workers: int = None):
+        """
+        batch_sound_events spread over a pool of processes. Every ray only depends on the static walls,
+        sender and reciever, so the fan is cut into parts, which are expanded independently.
+        The parts are merged in the order of their angles, so the result is the same as the serial one.
+        Not instrumented: the workers count into their own objects/stats.py, which is never sent back,
+        so stats.report() shows nothing of this path.
+
+        :param self: Positions and Rays, so the entire dataset.
+        :param max_order: The maximum order reflection. Only less iff recieved.
+        :param show: Add the recieved rays, walls, sender and reciever to the plot.
+        :param rounds: Amount of rays, which are send.
+        :param workers: Amount of processes, default is one per core.
+        """
+        assert max_order >= 0
+        reciever = (self.reciever, self.radius)
+        workers = workers or os.cpu_count() or 1
+
+        # a few parts per worker, so a slow part does not hold up everything.
+        parts = np.array_split(np.arange(rounds), 4 * workers)
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(trace, repeat(self.walls), repeat(self.sender), repeat(reciever),
+                                    repeat(max_order), repeat(rounds), parts))
+
+        # map keeps the order of the parts, so everything is ordered by angle.
+        recieved = []
+        for indices, ends, names, images in results:
+            recieved.append(indices)
+            self._add_images((Vector(self.reciever, Point([float(end[0]), float(end[1])])), label) for end, label in zip(ends, names))
+
+            # the image points of the walls, as if a single process had added them.
+            for w, collected in zip(self.walls, images):
+                for o, points in collected.items():
+                    for value in points:
+                        w.register(Point(value), o)
+
+        # single objects only for the recieved ones.
+        batch = RayBatch.sweep(self.sender, rounds, max_order, np.concatenate(recieved))
+        batch.expand(self.walls, reciever)
+        self.rays += batch.rays(self.walls, reciever)
+
+        if show:
+            self._plot_rays()
+
+
+    def adaptive_sound_events(self, max_order: int, show: bool = False, rounds: int = ROUNDS, step: int = 64):
+        """
+        Same image points as sound_events with rounds rays, but starts with every step-th angle and
+        only refines, where the wall sequence changes or the reciever is close (see objects/adaptive.py).
+
+        :param self: Positions and Rays, so the entire dataset.
+        :param max_order: The maximum order reflection. Only less iff recieved.
+        :param show: Add the recieved rays, walls, sender and reciever to the plot.
+        :param rounds: Resolution of the angles, like ROUNDS.
+        :param step: Distance of the coarse angles at the start.
+        """
+        assert max_order >= 0
+        reciever = (self.reciever, self.radius)
+
+        sweep = AdaptiveSweep(self.walls, self.sender, reciever, max_order, rounds, step)
+
+        # only take image points once, many are multiple, because of rounding buffer.
+        self._add_images(sweep.run())
+
+        # single objects only for the recieved ones.
+        batch = RayBatch.sweep(self.sender, rounds, max_order, sweep.recieved())
+        batch.expand(self.walls, reciever)
+        self.rays += batch.rays(self.walls, reciever)
+
+        if show:
+            self._plot_rays()
+
+
+    def exact_sound_events(self, max_order: int, show: bool = False):
+        """
+        Finds the image points directly from the walls and the sender (see objects/sources.py),
+        instead of waiting for a ray to hit the reciever. Does not depend on ROUNDS or the radius.
+
+        :param self: Positions, walls and images.
+        :param max_order: The maximum order reflection.
+        :param show: Add the image points, walls, sender and reciever to the plot.
+        """
+        assert max_order >= 0
+
+        # only take image points once, the sweep could have added some already.
+        self._add_images(image_sources(self.walls, self.sender, self.reciever, max_order))
+
+        if show:
+            self._plot_images()
+
+
+    def cached_sound_events(self, max_order: int, cache, decimals: int = 1, method: str = "exact", rounds: int = ROUNDS):
+        """
+        The whole flow of __main__ (sound events, create_edm and compare_point_pair_distances) through
+        the ResultCache of objects/cache.py. The same room, sender, reciever, order and radius comes straight
+        from the disk, everything else is computed like scenarios.run and stored for the next time.
+        Sets self.images, self.edm and self.distance_pairs, there are no Ray objects in self.rays then.
+
+        :param self: Positions, walls and radius.
+        :param max_order: The maximum order reflection.
+        :param cache: A ResultCache.
+        :param decimals: Decimals for the distance groups, like compare_point_pair_distances.
+        :param method: "exact" for image sources, "sweep" for rays (like multi_sound_events).
+        :param rounds: Amount of rays for the sweep.
+        """
+        assert max_order >= 0
+
+        scenario = Scenario(list(self.walls), self.sender, self.reciever, max_order, self.radius)
+        result = run([scenario], decimals, method, rounds, cache)[0]
+
+        self.images = [(Vector(self.reciever, Point(p)), label) for p, label in zip(result.points.tolist(), result.labels)]
+        self.edm = result.edm
+        self.distance_pairs = result.groups()
+        return self.distance_pairs
+
+
+    def beam_sound_events(self, max_order: int, show: bool = False):
+        """
+        Beam tracing (see objects/beams.py): reflects whole angular intervals instead of single rays and only
+        splits them at the corners. Every beam is one sequence of walls, so there is nothing to deduplicate,
+        and the beams containing the reciever are its image points. Does not depend on ROUNDS or the radius.
+        The beams are kept in self.beams, they only depend on the sender and the walls.
+
+        :param self: Positions, walls and images.
+        :param max_order: The maximum order reflection.
+        :param show: Add the image points, walls, sender and reciever to the plot.
+        """
+        assert max_order >= 0
+
+        with stats.stage("beams"):
+            self.beams = beam_tree(self.walls, self.sender, max_order)
+
+        # only take image points once, the sweep could have added some already.
+        self._add_images(heard(self.walls, self.reciever, self.beams))
+
+        if show:
+            self._plot_images()
+
+
+    def trajectory_sound_events(self, max_order: int, positions: list[Point]):
+        """
+        Follows a moving reciever (see objects/trajectory.py). The beams of the sender are traced once,
+        every position only checks, which of them contain the reciever, and only computes the EDM rows
+        of image points, which weren't visible at the position before.
+        Sets self.reciever, self.images and self.edm for every position and hands them out as (images, edm).
+
+        :param self: Positions, walls and images.
+        :param max_order: The maximum order reflection.
+        :param positions: The path of the reciever.
+        """
+        assert max_order >= 0
+
+        with stats.stage("beams"):
+            trajectory = Trajectory(self.walls, self.sender, max_order)
+        self.beams = trajectory.tree
+
+        for p in positions:
+            with stats.stage("trajectory step"):
+                self.reciever = p
+                self.images, self.edm = trajectory.move(p)
+            yield self.images, self.edm
+
+
+    def impulse_response(self, rate: int = 16000, attenuation: float | np.ndarray = 1., samples: int = None, heard: bool = False) -> np.ndarray:
+        """
+        The room impulse response of the image points (see objects/rir.py): every image point arrives
+        after its distance / speed of sound with 1 / distance, times the attenuation of its order.
+
+        :param self: The image points of any of the sound events.
+        :param rate: Sample rate in Hz.
+        :param attenuation: Reflection coefficient of the walls, or one factor for each order.
+        :param samples: Length of the response, long enough for the last arrival if None.
+        :param heard: One response per reciever of self.recievers (self.heard of multi_sound_events) instead.
+        :return: Shape (samples,), or (len(self.recievers), samples) for heard.
+        """
+        if heard:
+            return rir.from_images(self.heard, rate, attenuation, samples)
+        return rir.from_images([self.images], rate, attenuation, samples)[0]
+
+
+    def render(self, filename: str = None, labels: bool = True) -> Figure:
+        """
+        Headless version of the show flag: draws the recieved rays, walls and image points
+        in a few collections (see objects/render.py) and saves the figure without asking.
+        Run the sound events with show = False, then the plotting costs nothing until here.
+
+        :param filename: Where to save the figure, nothing is saved if None.
+        :param labels: Write the labels next to the image points.
+        """
+        rays = [r for r in self.rays if r.recieved]
+        return render(self.walls, self.sender, self.reciever, rays, self.images, filename, labels)
+
+
+    def create_edm(self, block: int = 512):
+        # distances of all the image points as float array, the labels are kept in their own index.
+        # self.edm.table() still gives the labelled list of lists for printing.
+        with stats.stage("edm"):
+            self.edm = EDM.create(self.images, block)
 
 
     def round_up(self, n, decimals=0):
@@ -152,41 +477,32 @@ class Engine:
         return math.ceil(n * factor) / factor
 
 
-    def compare_point_pair_distances(self, nd: int):
-        # self.distance_pairs hashes distances with their respective labeling
-        # check every element, even though it is symetric, but this is easier
-        for i, row in enumerate(self.edm[1:]):
-            for j, el in enumerate(row[1:]):
-
-                if self.images[i][1] == self.images[j][1]:
-                    continue
-                
-                # prepair the entry for comparison
-                item = (self.images[i][1], self.images[j][1])
-
-                # this distance exists already
-                if self.round_up(el, nd) in self.distance_pairs.keys():
-                    # check if its just the symmetric counter part.
-                    if not (self.images[j][1], self.images[i][1]) in self.distance_pairs[self.round_up(el, nd)]:
-                        self.distance_pairs[self.round_up(el, nd)].append(item)
+    def compare_point_pair_distances(self, nd: int, tolerance: float = None) -> dict:
+        # self.distance_pairs hashes distances with their respective labeling.
+        # distances, which are at most the tolerance (one step of the last decimal by default)
+        # above the first one of their group, are grouped together, only groups with more than one pair are kept.
+        # the same grouping as the batch results (scenarios.Result.groups).
+        with stats.stage("distance groups"):
+            groups = pair_groups(self.edm, nd, tolerance)
 
-                # new distance
-                else:
-                    self.distance_pairs[self.round_up(el, nd)] = [item]
+        # the group is named after its first distance rounded up to nd decimals, like the recorded data.
+        self.distance_pairs = labelled([label for _, label in self.images], *groups)
+        return self.distance_pairs
 
 
 if __name__ == "__main__":
     # some settings for good plots.
     reflection_order = 5
+    headless = "--headless" in sys.argv # no window and no questions, the figure is just saved.
      
     e = Engine()
     e.generate()
-    e.sound_events(reflection_order, True) # orders of reflection, which are allowed.
+    e.sound_events(reflection_order, not headless) # orders of reflection, which are allowed.
     e.create_edm()
     # print("Unfiltered EDM", e.edm)
     # print("Image points captured with (Position, Label): \n", e.images)
     line = ""
-    for row in e.edm:
+    for row in e.edm.table():
         line += "["
         for el in row:
             if isinstance(el, float):
@@ -196,21 +512,17 @@ if __name__ == "__main__":
         line += "]\n"
     # print("Rounded and formatted data", line)
 
-    e.compare_point_pair_distances(1)
-    # print("Unfilted distance pairs", e.distance_pairs)
-    # print()
-    filtered_data = {}
-    for key, value in e.distance_pairs.items():
-        if len(value) > 1:
-            filtered_data[key] = value
+    # only the distances, which more than one pair of image points share.
+    filtered_data = e.compare_point_pair_distances(1)
 
     print("Macros:", ROUNDS, e.radius)
     print("Filtered data", filtered_data)
 
     # 2. Packe sie in eine Liste
-    datasets = [sets.data1, sets.data2, sets.data3]
+    # only the names, each run is read from data/ when it is used.
+    datasets = ["data1", "data2", "data3"]
 
-    clear, rest, logs = analysis.split_dictionary_with_flags(datasets[1])
+    clear, rest, logs = analysis.split_dictionary_with_flags(sets.load(datasets[1]))
     # because we know, that the keys match, we just go through the keys of one.
     maxi = 0
     for key, value in rest.items():
@@ -230,10 +542,21 @@ if __name__ == "__main__":
     # analysis.analyze_and_print_new_patterns(echte_muster_d)
 
 
+    filename = f"data/o{reflection_order}s{ROUNDS}r{int(1000 * e.radius)}.png"
+    if headless:
+        # nobody is asked, so never into data/ and never over an older figure, the next free number instead.
+        os.makedirs("output", exist_ok=True)
+        base, ext = os.path.splitext(os.path.join("output", os.path.basename(filename)))
+        filename, k = base + ext, 1
+        while os.path.exists(filename):
+            filename, k = f"{base}-{k}{ext}", k + 1
+        e.render(filename)
+        print("Saved", filename)
+        sys.exit()
+
     plt.autoscale(False)
     plt.gca().set_aspect('equal', adjustable='box')
     fig = plt.gcf()
-    filename = f"data/o{reflection_order}s{ROUNDS}r{int(1000 * e.radius)}.png"
     fig.savefig(filename)
     plt.show()
 
@@ -0,0 +1,112 @@
+from objects.vector import Vector
+from objects.line import Line
+from objects.point import Point
+from objects.batch import RayBatch
+import numpy as np
+
+
+class AdaptiveSweep:
+    """
+    Sweeps the angles like Engine.sound_events, but only every step-th angle of the fan at first.
+    Between two neighbouring rays, the interval is cut in half again and again, as long as something
+    happens in between: the rays hit different walls (Ray.logger differs), one of them is recieved,
+    or the reciever lies between the lines of the same reflection of both rays.
+    Everywhere else, all the rays in between would take the same path and miss, so they are skipped.
+    """
+    def __init__(self, walls: list[Line], sender: Point, reciever: tuple[Point, float], order: int, rounds: int, step: int = 64):
+        assert order >= 0 and step >= 1
+        self.walls = walls
+        self.sender = sender
+        self.reciever = reciever
+        self.order = order
+        self.rounds = rounds # resolution of the fan, the same as ROUNDS.
+        self.step = step # distance of the coarse angles.
+        self.traced = 0 # amount of expanded rays.
+        self.logs = {} # angle index: wall sequence of the ray.
+        self.offsets = {} # angle index: signed distances of the reciever to the line of each segment.
+        self.hits = {} # angle index: (pov end, label), only recieved rays.
+
+    # ------------------------------------------------------------------------
+
+    def trace(self, indices: np.ndarray):
+        """
+        Expands the rays of the given angle indices all at once and saves what is needed.
+        """
+        batch = RayBatch.sweep(self.sender, self.rounds, self.order, indices, True)
+        batch.expand(self.walls, self.reciever)
+        self.traced += len(indices)
+
+        for i, x in enumerate(indices):
+            self.logs[int(x)] = batch.logger[i, :batch.steps[i]].tobytes()
+            self.offsets[int(x)] = batch.offsets[i]
+
+        for x, end, label in zip(indices[batch.recieved], batch.pov(self.reciever), batch.labels()):
+            self.hits[int(x)] = (end, label)
+
+    # ------------------------------------------------------------------------
+
+    def interesting(self, i: int, j: int) -> bool:
+        """
+        Decides, whether the interval between the two traced angles i and j needs more rays.
+        """
+        j = j % self.rounds
+        if self.logs[i] != self.logs[j] or i in self.hits or j in self.hits:
+            return True
+
+        # same walls, so the segments belong together. If the reciever is on different sides
+        # of them, a ray in between goes right through it.
+        a = self.offsets[i]
+        b = self.offsets[j]
+        both = ~np.isnan(a) & ~np.isnan(b)
+        return bool((np.sign(a[both]) != np.sign(b[both])).any())
+
+    # ------------------------------------------------------------------------
+
+    def run(self) -> list[tuple[Vector, str]]:
+        """
+        Traces the coarse fan and refines it, until no interesting interval is left.
+
+        :return: (position, label) pairs like in Engine.images, ordered by angle, every label once.
+        :rtype: list[tuple[Vector, str]]
+        """
+        coarse = np.arange(0, self.rounds, self.step)
+        self.trace(coarse)
+
+        # the last interval wraps around to the angle 0.
+        intervals = list(zip(coarse.tolist(), coarse[1:].tolist() + [self.rounds]))
+        while intervals:
+            todo = [(i, j) for i, j in intervals if j - i > 1 and self.interesting(i, j)]
+            if not todo:
+                break
+            mids = np.array([(i + j) // 2 for i, j in todo])
+            self.trace(mids)
+            intervals = []
+            for (i, j), m in zip(todo, mids.tolist()):
+                intervals += [(i, m), (m, j)]
+
+        return self.images()
+
+    # ------------------------------------------------------------------------
+
+    def images(self) -> list[tuple[Vector, str]]:
+        """
+        Only take image points once, first come first serve in the order of the angles.
+        """
+        rec, _ = self.reciever
+        res = []
+        seen = set()
+        for x in sorted(self.hits):
+            end, label = self.hits[x]
+            if label in seen:
+                continue
+            seen.add(label)
+            res.append((Vector(rec, Point([float(end[0]), float(end[1])])), label))
+        return res
+
+    # ------------------------------------------------------------------------
+
+    def recieved(self) -> np.ndarray:
+        """
+        Angle indices of all the recieved rays, sorted.
+        """
+        return np.array(sorted(self.hits), dtype=np.int64)
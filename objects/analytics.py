@@ -1,28 +1,31 @@
-def shredded(w: str) -> str:
+try:
+    from objects.labels import reflections
+except ModuleNotFoundError: # run as a script from within objects.
+    from labels import reflections
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65536)
+def shredded(w: str | tuple[int, ...]) -> str | tuple[int, ...]:
     """
     Takes a string, representing a reflection history and performs all the cancellation.
     So if the same mirror is there back to back, then remove both, because it doesnt change
     the image point.
+    Each character is one mirror, rooms with more than 9 walls need the walls as tuple (see labels.reflections),
+    then a tuple comes back.
+    The same words come up again and again in matchings, so the results are cached.
     """
-    if w == "": return w
-
-    while True:
-        flag = True
-        prev = ""
-        for i, c in enumerate(w):
-            # same mirror back to back
-            if prev == c:
-                # remove the mirrors
-                w = w[:i-1] + w[i+1:]
-                # can't end the loop here, because new cancelation could have been created.
-                flag = False
-                break
-            prev = c
-
-        # if we went through the string and no cancellation appeared, then we can return the string.
-        if flag:
-            break
-    return w
+    # one pass with a stack: a mirror cancels the one on top, which also uncovers
+    # the next possible cancellation without starting over.
+    stack = []
+    for c in w:
+        if stack and stack[-1] == c:
+            stack.pop()
+        else:
+            stack.append(c)
+    if isinstance(w, str):
+        return "".join(stack)
+    return tuple(stack)
 
 # ----------------------------------------------------------------------------
 
@@ -33,11 +36,11 @@ def matchings(p1: tuple[str, str], p2: tuple[str, str]) -> bool:
     Iw1, Iw2 = p1
     Iv1, Iv2 = p2
 
-    # remove the I
-    w1 = Iw1[1:]
-    w2 = Iw2[1:]
-    v1 = Iv1[1:]
-    v2 = Iv2[1:]
+    # remove the I, the walls as tuples, so numbers above 9 are one mirror as well.
+    w1 = reflections(Iw1)
+    w2 = reflections(Iw2)
+    v1 = reflections(Iv1)
+    v2 = reflections(Iv2)
 
     # created the two possible mirror sequences with inversing w1, so we have
     # w1 + w1^-1, then adds either v1 or v2, so the entire result is v1 or v2
@@ -56,6 +59,20 @@ def matchings(p1: tuple[str, str], p2: tuple[str, str]) -> bool:
 
 # ----------------------------------------------------------------------------
 
+def canonical(p: tuple[str, str]) -> tuple[int, ...]:
+    """
+    Canonical form of a point pair for matchings. Every mirror is its own inverse, so the
+    reversed history is the inverse one and shredded reduces like in a free group.
+    Two pairs match, if the sequence w2 w1^-1 of one is the same as v2 v1^-1 of the other, or its inverse
+    (that is exactly what matchings tries with s1 and s2). So the smaller one of both is the key.
+    Only holds for reduced labels, which all the recorded ones are, because no ray hits the same wall twice in a row.
+    """
+    w1, w2 = reflections(p[0]), reflections(p[1])
+    g = shredded(w2 + w1[::-1])
+    return min(g, g[::-1])
+
+# ----------------------------------------------------------------------------
+
 def split_dictionary_with_flags(data: dict):
     """
     Works entirely on filtered data. So demands a structure:
@@ -65,11 +82,12 @@ def split_dictionary_with_flags(data: dict):
 
     Also wants the data to have filtered out all the length one lists, because they can't have
     any group.
-    """
 
-    # alphabet for labeling in a group of 10 < size < 37
-    alphabet = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm',
- 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z']
+    Instead of calling matchings for every two pairs, each pair is reduced to its canonical form once,
+    and pairs with the same form are in a group. So a bucket costs one reduction per pair and
+    there is no limit on the size of a bucket anymore.
+    logs holds the group of each pair as integer, counted from 0 in each bucket, -1 if it has no partner.
+    """
 
     # Output initialisation
     clear = {}
@@ -79,52 +97,30 @@ def split_dictionary_with_flags(data: dict):
     # go through the data
     for key, value in data.items():
 
-        # make an empty flag entry for each point pair in the iteration.
-        flags = [""] * len(value)
-
-        # compare each point paire with each other:
-        for i in range(len(value)): 
-            for j in range(len(value)):
-
-                if i == j: continue
-
-                # boolean, if they are reducable to each other, through some reflection sequence s
-                matches = matchings(value[i], value[j])
+        # hash each point pair by its canonical form.
+        forms = [canonical(p) for p in value]
+        sizes = {}
+        for form in forms:
+            sizes[form] = sizes.get(form, 0) + 1
 
-                # add label, so we later now, that these two are in a group
-                if matches:
-                    append_for_i = ""
-                    append_for_j = ""
-                    if j > 9:
-                        append_for_i = alphabet[j-10]
-                    else:
-                        append_for_i = str(j)
-
-                    if i > 9:
-                        append_for_j = alphabet[i-10]
-                    else:
-                        append_for_j = str(i)
-
-                    flags[i] += append_for_i
-                    flags[j] += append_for_j
+        # integer ids in the order the groups appear, the pairs without partner get none.
+        ids = {}
+        for form in forms:
+            if sizes[form] > 1 and form not in ids:
+                ids[form] = len(ids)
 
         clear[key] = []
         rest[key] = []
-
-        # format the falgs, filter out the doubles.
-        ff = []
-        for flag in flags:
-            ff.append("".join(dict.fromkeys(flag)))
+        logs[key] = []
 
         # split all the grouped once with those who are groupless:
-        logs[key] = ff
-        for ind, flag in enumerate(flags):
-            if flag != "":
-                clear[key].append(value[ind])
+        for pair, form in zip(value, forms):
+            logs[key].append(ids.get(form, -1))
+            if form in ids:
+                clear[key].append(pair)
             else:
-                rest[key].append(value[ind])
+                rest[key].append(pair)
 
-    
     return clear, rest, logs
 
 
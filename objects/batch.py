@@ -0,0 +1,513 @@
+from objects.vector import Vector
+from objects.line import Line
+from objects.point import Point
+from objects.ray import Ray
+from objects.labels import make_label
+from objects.receivers import ReceiverGrid
+from objects.walls import WallIndex
+import objects.stats as stats
+import numpy as np
+
+
+def square(x: np.ndarray) -> np.ndarray:
+    """
+    x ** 2 like python floats do it, with pow and not with x * x.
+    The two can differ in the last bit and then the batch would not match the single rays anymore.
+    """
+    return np.float_power(x, 2)
+
+# ----------------------------------------------------------------------------
+
+
+class RayBatch:
+    """
+    Holds an entire sweep of rays as numpy arrays instead of single Ray objects.
+    Every call to step advances all the rays, which are still travelling, by one order of reflection.
+    The arithmetic follows Ray.expand, Line.intersection and Line.mirror operation by operation,
+    so the recieved rays, their logs and their pov points are the same as with the per object path.
+    """
+    def __init__(self, anchors: np.ndarray, ends: np.ndarray, order: int, passes: bool = False):
+        assert order >= 0
+        n = len(anchors)
+        self.order = order
+        self.origins = np.array(anchors, dtype=np.float64) # starting vectors, like Vector(v, u) of a Ray.
+        self.ends = np.array(ends, dtype=np.float64)
+        self.anchors = self.origins.copy() # current anchor of each line, sender or image point.
+        self.directions = self.ends - self.origins # current direction of each line.
+        self.starts = self.anchors.copy() # the anchor of the last traced segment (what values[-1].anchor is).
+        self.prev = np.zeros((n, 2)) # previous intersection point.
+        self.has_prev = np.zeros(n, dtype=bool)
+        self.block = np.full(n, -1, dtype=np.int64) # blocked wall, so no reflection of the same wall twice in a row.
+        self.recieved = np.zeros(n, dtype=bool)
+        self.active = np.ones(n, dtype=bool) # still travelling, neither recieved nor out of reflections.
+        self.length = np.zeros(n) # entire distance travelled so far.
+        self.logger = np.zeros((n, order + 1), dtype=np.int16) # same entries as Ray.logger, 0 is unused.
+        self.steps = np.zeros(n, dtype=np.int64) # amount of valid entries in logger.
+        self.walls = 0 # amount of walls of the room, set by step, only for the labels.
+        self.expanded = False
+
+        # hits of many recievers (ReceiverGrid), one array per step: ray, reciever, order, length, start.
+        self.heard = []
+
+        # optional: signed distance of the reciever to the line of each segment, nan if the ray
+        # never got there. Costs a float per ray and order, so only if wished.
+        self.offsets = np.full((n, order + 1), np.nan) if passes else None
+
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def sweep(cls, sender: Point, rounds: int, order: int, indices: np.ndarray = None, passes: bool = False) -> "RayBatch":
+        """
+        Creates the same fan of rays as Engine.sound_events, one for each angle 2pi * x / rounds.
+
+        :param sender: Starting point of all rays.
+        :type sender: Point
+        :param rounds: Amount of rays.
+        :type rounds: int
+        :param order: maximum order of reflection.
+        :type order: int
+        :param indices: Only these x of the fan, default is all of them.
+        :type indices: np.ndarray
+        :param passes: Keep track of where the rays pass the reciever.
+        :type passes: bool
+        :return: a batch, which is not expanded yet.
+        :rtype: RayBatch
+        """
+        x = np.arange(rounds) if indices is None else np.asarray(indices)
+        s = np.array(sender.value, dtype=np.float64)
+        angles = (2 * np.pi) * (x / rounds)
+
+        # the same as Vector(sender, Point(sender + (cos, sin))).
+        ends = np.stack([s[0] + np.cos(angles), s[1] + np.sin(angles)], axis=1)
+        anchors = np.broadcast_to(s, (len(x), 2))
+        return cls(anchors, ends, order, passes)
+
+    # ------------------------------------------------------------------------
+
+    def expand(self, walls: list[Line], reciever: tuple[Point, float] | ReceiverGrid) -> np.ndarray:
+        """
+        Expands all the rays, until they are recieved or reflected order times.
+        Also adds the image points to the walls, like Line.image does.
+        With many recievers (ReceiverGrid), the rays are never stopped, instead every segment is
+        tested against the recievers near it and the hits are saved in self.heard.
+
+        :param walls: The walls, where the rays get reflected off.
+        :type walls: list[Line]
+        :param reciever: The position of the reciever and the radius, which we count as recieved in.
+        :type reciever: tuple[Point, float] | ReceiverGrid
+        :return: Mask of the recieved rays.
+        :rtype: np.ndarray
+        """
+        # environment is static, so once is enough.
+        if self.expanded:
+            return self.recieved
+        self.expanded = True
+
+        for o in range(0, self.order + 1):
+            if not self.active.any():
+                break
+            self.step(walls, reciever, o)
+
+        return self.recieved
+
+    # ------------------------------------------------------------------------
+
+    def step(self, walls: list[Line], reciever: tuple[Point, float] | ReceiverGrid, o: int):
+        """
+        One iteration of the loop in Ray.expand, but for all active rays at once.
+
+        :param walls: The walls, where the rays get reflected off.
+        :type walls: list[Line]
+        :param reciever: The position of the reciever and the radius, or many recievers.
+        :type reciever: tuple[Point, float] | ReceiverGrid
+        :param o: current order of reflection.
+        :type o: int
+        """
+        self.walls = len(walls)
+        if isinstance(walls, WallIndex):
+            return self._segments(walls, reciever, o)
+
+        idx = np.flatnonzero(self.active)
+        a = self.anchors[idx]
+        d = self.directions[idx]
+        prev = self.prev[idx]
+        has_prev = self.has_prev[idx]
+        block = self.block[idx]
+
+        # intersections with each wall, with the wall as (p,r) and the ray as (q,s).
+        wa = np.array([w.anchor.value for w in walls], dtype=np.float64)
+        wr = np.array([w.direction.value for w in walls], dtype=np.float64)
+        r0, r1 = wr[:, 0][None, :], wr[:, 1][None, :]
+        p0, p1 = wa[:, 0][None, :], wa[:, 1][None, :]
+        q0, q1 = a[:, 0][:, None], a[:, 1][:, None]
+        s0, s1 = d[:, 0][:, None], d[:, 1][:, None]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            det = (r1 * s0) - (r0 * s1)
+            y = (r1 * (p0 - q0) + r0 * (q1 - p1)) / det
+        hit = (det != 0) & (y > 0)
+        hit &= np.arange(len(walls))[None, :] != block[:, None]
+        ix = q0 + y * s0
+        iy = q1 + y * s1
+
+        # intersection with the reciever, many recievers are tested on the finished segments instead.
+        if isinstance(reciever, ReceiverGrid):
+            rx = np.full(len(idx), np.nan)
+            ry = np.full(len(idx), np.nan)
+            rec_hit = np.zeros(len(idx), dtype=bool)
+        else:
+            rx, ry, rec_hit = self._circle(a, d, reciever)
+
+        # all candidates, the reciever is the last column like in Ray.expand.
+        cx = np.concatenate([ix, rx[:, None]], axis=1)
+        cy = np.concatenate([iy, ry[:, None]], axis=1)
+        valid = np.concatenate([hit, rec_hit[:, None]], axis=1)
+
+        # distance to the anchor as the deciding metric.
+        vx = cx - q0
+        vy = cy - q1
+        dist = np.sqrt(square(vx) + square(vy))
+
+        # guarding the special case of walls outside of the body, like in Ray.expand.
+        px = prev[:, 0] - a[:, 0]
+        py = prev[:, 1] - a[:, 1]
+        prev_dist = np.sqrt(square(px) + square(py))
+        dist[has_prev[:, None] & (dist <= prev_dist[:, None])] = np.inf
+        dist[~valid] = np.inf
+
+        # take the closest legal intersection.
+        m = np.argmin(dist, axis=1)
+        rows = np.arange(len(idx))
+
+        # the new segment ends at the reciever or at the chosen wall.
+        got = rec_hit
+        end = np.where(got[:, None], np.stack([rx, ry], axis=1), np.stack([cx[rows, m], cy[rows, m]], axis=1))
+
+        # rays without a legal wall would crash Ray.expand, here they are dropped.
+        lost = ~got & ~valid[rows, m]
+
+        start = np.where(has_prev[:, None], prev, a)
+        self._advance(walls, reciever, o, idx, a, m, got, lost, start, end)
+
+    # ------------------------------------------------------------------------
+
+    def _segments(self, walls: WallIndex, reciever: tuple[Point, float] | ReceiverGrid, o: int):
+        """
+        step for finite walls: every ray walks through the grid of the WallIndex from where it is
+        and stops at the first wall, the reciever only counts on the way there.
+        """
+        idx = np.flatnonzero(self.active)
+        a = self.anchors[idx]
+        d = self.directions[idx]
+        start = np.where(self.has_prev[idx][:, None], self.prev[idx], a)
+
+        m, t = walls.cast(start, d, self.block[idx])
+        lost = m < 0
+        with np.errstate(invalid="ignore"):
+            end = start + np.where(lost, 0., t)[:, None] * d
+
+        if isinstance(reciever, ReceiverGrid):
+            got = np.zeros(len(idx), dtype=bool)
+        else:
+            rx, ry, got = self._circle(start, d, reciever)
+            # the circle test is on the whole line, so only count it between the start and the wall.
+            with np.errstate(invalid="ignore"):
+                tc = ((rx - start[:, 0]) * d[:, 0] + (ry - start[:, 1]) * d[:, 1]) / (square(d[:, 0]) + square(d[:, 1]))
+            got &= (tc > 0) & (tc <= t)
+            end = np.where(got[:, None], np.stack([rx, ry], axis=1), end)
+
+        # the reciever is the column after the last wall, like in Ray.expand.
+        m = np.where(got, len(walls), m)
+        lost &= ~got
+        self._advance(walls, reciever, o, idx, a, m, got, lost, start, end)
+
+    # ------------------------------------------------------------------------
+
+    def _advance(self, walls: list[Line] | WallIndex, reciever: tuple[Point, float] | ReceiverGrid, o: int, idx: np.ndarray,
+                 a: np.ndarray, m: np.ndarray, got: np.ndarray, lost: np.ndarray, start: np.ndarray, end: np.ndarray):
+        """
+        The second half of a step: logs the chosen walls, adds the new segments and mirrors the rays.
+        m is the chosen column (len(walls) for the reciever), got the recieved and lost the dropped rays.
+        """
+        self.logger[idx, self.steps[idx]] = m + 1
+        self.steps[idx] += 1
+        self.block[idx] = m
+
+        if isinstance(reciever, ReceiverGrid):
+            self._listen(idx[~lost], o, start[~lost], end[~lost], reciever)
+        sx = end[:, 0] - start[:, 0]
+        sy = end[:, 1] - start[:, 1]
+        self.length[idx] += np.sqrt(square(sx) + square(sy))
+        self.starts[idx] = start
+        self.prev[idx] = end
+        self.has_prev[idx] = True
+
+        if self.offsets is not None:
+            self._passing(idx, o, start, sx, sy, reciever)
+
+        self.recieved[idx[got]] = True
+        self.active[idx[got | lost]] = False
+
+        # out of reflections, but the last image is still created like in Ray.expand.
+        if o == self.order:
+            self.active[idx] = False
+
+        # reflect everything else of its wall, this is the image source method.
+        # sorted by wall, so rooms with many walls don't scan all the rays once per wall.
+        go = np.flatnonzero(~got & ~lost)
+        go = go[np.argsort(m[go], kind="stable")]
+        walls_hit, first = np.unique(m[go], return_index=True)
+        for j, sel in zip(walls_hit.tolist(), np.split(go, first[1:])):
+            w = walls[j]
+            anchor = w.mirror_many(a[sel])
+            self.anchors[idx[sel]] = anchor
+            self.directions[idx[sel]] = end[sel] - anchor
+            self._register(w, anchor, o)
+
+    # ------------------------------------------------------------------------
+
+    def _listen(self, idx: np.ndarray, o: int, start: np.ndarray, end: np.ndarray, grid: ReceiverGrid):
+        """
+        Tests the new segments against the recievers near them and saves the hits.
+        Has to happen before the length of the segment is added.
+        """
+        seg, rec, points = grid.hits(start, end)
+        if len(seg) == 0:
+            return
+        s = start[seg]
+        length = self.length[idx[seg]] + np.sqrt(square(points[:, 0] - s[:, 0]) + square(points[:, 1] - s[:, 1]))
+        self.heard.append((idx[seg], rec, np.full(len(seg), o), length, s))
+
+    # ------------------------------------------------------------------------
+
+    def _passing(self, idx: np.ndarray, o: int, start: np.ndarray, sx: np.ndarray, sy: np.ndarray, reciever: tuple[Point, float]):
+        """
+        Saves the signed distance of the reciever to the lines of the new segments.
+        The whole line counts, because the circle test in Line.intersection does not look at t either.
+        """
+        rec, _ = reciever
+        wx = rec.value[0] - start[:, 0]
+        wy = rec.value[1] - start[:, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.offsets[idx, o] = (sx * wy - sy * wx) / np.sqrt(sx * sx + sy * sy)
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _circle(a: np.ndarray, d: np.ndarray, reciever: tuple[Point, float]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The circle case of Line.intersection for many lines.
+        Returns the x and y coordinates and the mask of intersecting lines.
+        """
+        (p, r) = reciever
+        ax = a[:, 0] - p.value[0]
+        ay = a[:, 1] - p.value[1]
+
+        # quadratic formula, see Line.intersection.
+        qa = square(d[:, 0]) + square(d[:, 1])
+        qb = 2 * d[:, 0] * ax + 2 * d[:, 1] * ay
+        qc = square(ax) + square(ay) - r ** 2
+        hit = ~(square(qb) < 4 * qa * qc)
+
+        with np.errstate(invalid="ignore"):
+            root = np.sqrt(square(qb) - 4 * qa * qc)
+        t1 = (-qb + root) / (2 * qa)
+        t2 = (-qb - root) / (2 * qa)
+
+        x1 = a[:, 0] + t1 * d[:, 0]
+        y1 = a[:, 1] + t1 * d[:, 1]
+        x2 = a[:, 0] + t2 * d[:, 0]
+        y2 = a[:, 1] + t2 * d[:, 1]
+
+        # return the closest to the anchor, the squares are enough like in Line.intersection.
+        l1 = square(a[:, 0] - x1) + square(a[:, 1] - y1)
+        l2 = square(a[:, 0] - x2) + square(a[:, 1] - y2)
+        first = (t1 == t2) | (l1 < l2)
+        return np.where(first, x1, x2), np.where(first, y1, y2), hit
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _register(wall: Line, anchors: np.ndarray, order: int):
+        """
+        Adds the new image points to the walls hashmap, in the same order as the single rays would.
+        """
+        # adding 0. turns -0. into 0., so the byte wise unique agrees with the float comparison.
+        _, first = np.unique(anchors + 0., axis=0, return_index=True)
+        for i in np.sort(first):
+            wall.register(Point([float(anchors[i, 0]), float(anchors[i, 1])]), order)
+
+    # ------------------------------------------------------------------------
+
+    def labels(self) -> list[str]:
+        """
+        The labels of all the recieved rays, created like in Ray.pov.
+        """
+        return [make_label(self.logger[i, :self.steps[i] - 1].tolist(), self.walls) for i in np.flatnonzero(self.recieved)]
+
+    # ------------------------------------------------------------------------
+
+    def pov(self, reciever: tuple[Point, float]) -> np.ndarray:
+        """
+        Ray.pov for all the recieved rays, but without the plot.
+        Returns the end points of the pov vectors, in the order of the rays.
+        """
+        rec, rad = reciever
+        sel = self.recieved
+        return self._pov(np.array(rec.value, dtype=np.float64), self.starts[sel], self.length[sel], rad)
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _pov(c: np.ndarray, starts: np.ndarray, length: np.ndarray, rad: float) -> np.ndarray:
+        """
+        The pov end points seen from c, for segments starting at starts after the entire distance length.
+        """
+        vx = starts[:, 0] - c[0]
+        vy = starts[:, 1] - c[1]
+
+        # normalized, but protected against zero length like Vector.normalized.
+        zero = (vx == 0.) & (vy == 0.)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = 1. / np.sqrt(square(vx) + square(vy))
+            ux = np.where(zero, vx, (c[0] + vx * scale) - c[0])
+            uy = np.where(zero, vy, (c[1] + vy * scale) - c[1])
+
+        # scaled by the entire distance.
+        k = length + rad
+        return np.stack([c[0] + ux * k, c[1] + uy * k], axis=1)
+
+    # ------------------------------------------------------------------------
+
+    def images(self, reciever: tuple[Point, float]) -> list[tuple[Vector, str]]:
+        """
+        The (pov, label) pairs of Engine.images, every label only once, first come first serve.
+        """
+        rec, _ = reciever
+        res = []
+        seen = set()
+        for end, label in zip(self.pov(reciever), self.labels()):
+            if label in seen:
+                continue
+            seen.add(label)
+            res.append((Vector(rec, Point([float(end[0]), float(end[1])])), label))
+        return res
+
+    # ------------------------------------------------------------------------
+
+    def heard_images(self, grid: ReceiverGrid) -> list[list[tuple[Vector, str]]]:
+        """
+        The (pov, label) pairs for each of the many recievers, like Engine.images for a single one.
+        Only the first hit of a ray counts for every reciever, because a single reciever would have
+        stopped the ray there. Every label once per reciever, ordered by the rays.
+        """
+        res = [[] for _ in range(len(grid))]
+        if not self.heard:
+            return res
+        rays, recs, orders, length, starts = (np.concatenate(column) for column in zip(*self.heard))
+
+        # sort by reciever, ray and order and keep the first hit of each ray.
+        first = np.lexsort((orders, rays, recs))
+        rays, recs, orders, length, starts = rays[first], recs[first], orders[first], length[first], starts[first]
+        keep = np.ones(len(rays), dtype=bool)
+        keep[1:] = (rays[1:] != rays[:-1]) | (recs[1:] != recs[:-1])
+        rays, recs, orders, length, starts = rays[keep], recs[keep], orders[keep], length[keep], starts[keep]
+
+        seen = [set() for _ in range(len(grid))]
+        for j in np.unique(recs):
+            sel = recs == j
+            c = grid.points[j]
+            ends = self._pov(c, starts[sel], length[sel], grid.radius)
+            for i, o, end in zip(rays[sel], orders[sel], ends):
+                label = make_label(self.logger[i, :o].tolist(), self.walls)
+                if label in seen[j]:
+                    continue
+                seen[j].add(label)
+                res[j].append((Vector(grid.recievers[j], Point([float(end[0]), float(end[1])])), label))
+        return res
+
+    # ------------------------------------------------------------------------
+
+    def rays(self, walls: list[Line], reciever: tuple[Point, float]) -> list[Ray]:
+        """
+        Creates single Ray objects for the recieved rays only, so they can be plotted as usual.
+        Only the recieved ones are worth it, everything else is just a black mess anyways.
+        """
+        res = []
+        # the batch traced these rays already, so the counters of Ray.expand would count them twice.
+        with stats.paused():
+            for i in np.flatnonzero(self.recieved):
+                v = Point([float(self.origins[i, 0]), float(self.origins[i, 1])])
+                u = Point([float(self.ends[i, 0]), float(self.ends[i, 1])])
+                ray = Ray(Vector(v, u), self.order)
+                ray.expand(walls, reciever, False)
+                res.append(ray)
+        return res
+
+# ----------------------------------------------------------------------------
+
+def trace(walls: list[Line], sender: Point, reciever: tuple[Point, float], order: int, rounds: int, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray, list[str], list[dict]]:
+    """
+    Expands one part of the fan, meant to run in its own process (see Engine.parallel_sound_events).
+    Everything is returned as plain values, because the walls of the worker are only copies.
+
+    :param walls: The walls of the room.
+    :type walls: list[Line]
+    :param sender: Starting point of all rays.
+    :type sender: Point
+    :param reciever: The position of the reciever and the radius.
+    :type reciever: tuple[Point, float]
+    :param order: maximum order of reflection.
+    :type order: int
+    :param rounds: Resolution of the fan.
+    :type rounds: int
+    :param indices: The angle indices of this part.
+    :type indices: np.ndarray
+    :return: angle indices of the recieved rays, their pov end points, their labels and the image
+             points each wall collected, as {order: list of coordinates}.
+    :rtype: tuple[np.ndarray, np.ndarray, list[str], list[dict]]
+    """
+    for w in walls:
+        w.images = {}
+    batch = RayBatch.sweep(sender, rounds, order, indices)
+    batch.expand(walls, reciever)
+    images = [{o: [p.value for p in points] for o, points in w.images.items()} for w in walls]
+    return np.asarray(indices)[batch.recieved], batch.pov(reciever), batch.labels(), images
+
+# ----------------------------------------------------------------------------
+
+def stream(walls: list[Line], sender: Point, reciever: tuple[Point, float], order: int, rounds: int, chunk: int = 4096):
+    """
+    Expands the fan chunk by chunk and yields the recieved rays as soon as their chunk is done.
+    Missed rays are dropped right away, so the memory only depends on chunk, not on rounds.
+
+    :param walls: The walls of the room.
+    :type walls: list[Line]
+    :param sender: Starting point of all rays.
+    :type sender: Point
+    :param reciever: The position of the reciever and the radius.
+    :type reciever: tuple[Point, float]
+    :param order: maximum order of reflection.
+    :type order: int
+    :param rounds: Resolution of the fan.
+    :type rounds: int
+    :param chunk: Amount of rays traced at once.
+    :type chunk: int
+    :return: (angle index, label, path length, incoming direction) for every recieved ray, ordered by angle.
+             The direction is the unit vector from the reciever towards the last reflection (or the sender).
+    :rtype: Iterator[tuple[int, str, float, tuple[float, float]]]
+    """
+    assert chunk >= 1
+    rec, _ = reciever
+    c = np.array(rec.value, dtype=np.float64)
+    for first in range(0, rounds, chunk):
+        indices = np.arange(first, min(first + chunk, rounds))
+        batch = RayBatch.sweep(sender, rounds, order, indices)
+        batch.expand(walls, reciever)
+
+        sel = batch.recieved
+        v = batch.starts[sel] - c
+        with np.errstate(divide="ignore", invalid="ignore"):
+            v = v / np.sqrt(square(v[:, 0]) + square(v[:, 1]))[:, None]
+        for x, label, length, d in zip(indices[sel].tolist(), batch.labels(), batch.length[sel].tolist(), v.tolist()):
+            yield x, label, length, (d[0], d[1])
@@ -0,0 +1,201 @@
+from objects.vector import Vector
+from objects.line import Line
+from objects.point import Point
+from objects.labels import make_label
+from objects.walls import WallIndex
+from objects.room import Room
+import objects.stats as stats
+import numpy as np
+import math
+
+
+class Beam:
+    """
+    All the rays, which leave the (image) source in the directions between lo and hi and all took the same walls.
+    The angles are measured against ref, so a beam never wraps around (only the first one spans the full circle).
+    The rays only start behind the last wall of the sequence, the window, which is where they got reflected.
+    """
+    __slots__ = ("sequence", "source", "ref", "lo", "hi")
+
+    def __init__(self, sequence: list[int], source: np.ndarray, ref: np.ndarray, lo: float, hi: float):
+        self.sequence = sequence
+        self.source = source
+        self.ref = ref
+        self.lo = lo
+        self.hi = hi
+
+    # ------------------------------------------------------------------------
+
+    def angles(self, points: np.ndarray) -> np.ndarray:
+        """
+        The angles of the points seen from the source, against ref, in (-pi, pi].
+        """
+        v = points - self.source
+        return np.arctan2(self.ref[0] * v[:, 1] - self.ref[1] * v[:, 0], self.ref[0] * v[:, 0] + self.ref[1] * v[:, 1])
+
+    # ------------------------------------------------------------------------
+
+    def __repr__(self):
+        return f"Beam({self.sequence}, {self.lo:.6f}, {self.hi:.6f})"
+
+# ----------------------------------------------------------------------------
+
+def room(walls: list[Line] | WallIndex) -> WallIndex:
+    """
+    Beams split at the ends of the walls, so they need finite walls. Infinite lines like the ones of
+    Engine.generate are turned into the Room between them (neighbouring lines in the list must be neighbouring walls).
+    """
+    if isinstance(walls, WallIndex):
+        return walls
+    return Room.from_lines(walls)
+
+# ----------------------------------------------------------------------------
+
+def _turn(ref: np.ndarray, angles: np.ndarray) -> np.ndarray:
+    """
+    ref turned by the angles, shape (n, 2) each.
+    """
+    c, s = np.cos(angles), np.sin(angles)
+    return np.stack([c * ref[:, 0] - s * ref[:, 1], s * ref[:, 0] + c * ref[:, 1]], axis=1)
+
+# ----------------------------------------------------------------------------
+
+def _on(walls: WallIndex, j: np.ndarray, sources: np.ndarray, directions: np.ndarray) -> np.ndarray:
+    """
+    The step t along the directions, where the lines from the sources cross the (infinite) line of wall j.
+    0 for j = -1, so the rays of the first beam start at the sender.
+    """
+    k = np.maximum(j, 0)
+    a = walls.starts[k]
+    r = walls.ends[k] - a
+    w = a - sources
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (w[:, 0] * r[:, 1] - w[:, 1] * r[:, 0]) / (directions[:, 0] * r[:, 1] - directions[:, 1] * r[:, 0])
+    return np.where(j >= 0, t, 0.)
+
+# ----------------------------------------------------------------------------
+
+def beam_tree(walls: list[Line] | WallIndex, sender: Point, max_order: int, eps: float = 1e-12) -> list[Beam]:
+    """
+    Beam tracing: instead of single rays, whole angular intervals are reflected. A beam is only split,
+    where one of the corners (the ends of the walls) lies inside of it, so within each piece the rays all
+    hit the same wall. Every piece gets mirrored (Line.mirror) into a new beam of the next order.
+    The amount of work grows with the amount of different sequences of walls and not with ROUNDS.
+    Only depends on the sender and the walls, like sources.mirror_tree.
+
+    :param walls: The walls of the room, infinite lines or finite ones.
+    :type walls: list[Line] | WallIndex
+    :param sender: Position of the sender.
+    :type sender: Point
+    :param max_order: The maximum order of reflection.
+    :type max_order: int
+    :param eps: Pieces narrower than this angle are dropped, they only come from corners.
+    :type eps: float
+    :return: All the beams, ordered by order, starting with the one of the sender.
+    :rtype: list[Beam]
+    """
+    assert max_order >= 0
+    walls = room(walls)
+    corners = np.concatenate([walls.starts, walls.ends])
+    level = [Beam([], np.array(sender.value[:2], dtype=np.float64), np.array([1., 0.]), -math.pi, math.pi)]
+    res = list(level)
+
+    for o in range(max_order):
+        # cut every beam at the corners inside of it.
+        owner, lo, hi = [], [], []
+        for b, beam in enumerate(level):
+            a = beam.angles(corners)
+            cuts = np.unique(np.concatenate([[beam.lo, beam.hi], a[(a > beam.lo) & (a < beam.hi)]]))
+            owner.append(np.full(len(cuts) - 1, b))
+            lo.append(cuts[:-1])
+            hi.append(cuts[1:])
+        owner, lo, hi = np.concatenate(owner), np.concatenate(lo), np.concatenate(hi)
+
+        # the wall of each piece is the one its middle ray hits after the window.
+        sources = np.array([beam.source for beam in level])[owner]
+        refs = np.array([beam.ref for beam in level])[owner]
+        block = np.array([beam.sequence[-1] if beam.sequence else -1 for beam in level], dtype=np.int64)[owner]
+        d = _turn(refs, 0.5 * (lo + hi))
+        t = _on(walls, block, sources, d)
+        wall, _ = walls.cast(sources + t[:, None] * d, d, block)
+
+        # neighbouring pieces with the same wall are one beam again.
+        first = np.ones(len(owner), dtype=bool)
+        first[1:] = (owner[1:] != owner[:-1]) | (wall[1:] != wall[:-1])
+        start = np.flatnonzero(first)
+        end = np.append(start[1:], len(owner)) - 1
+        owner, wall, lo, hi = owner[start], wall[start], lo[start], hi[end]
+        keep = (wall >= 0) & (hi - lo > eps)
+        owner, wall, lo, hi, sources, refs = owner[keep], wall[keep], lo[keep], hi[keep], sources[start][keep], refs[start][keep]
+        stats.count("beams split", len(start))
+
+        # the window of the new beam is the part of the wall between lo and hi.
+        following = []
+        for side in (lo, hi):
+            d = _turn(refs, side)
+            following.append(sources + _on(walls, wall, sources, d)[:, None] * d)
+        p, q = following
+        following = []
+        for b, j, s, x, y in zip(owner.tolist(), wall.tolist(), sources, p, q):
+            image = np.array(walls[j].mirror(s[0], s[1]))
+            beam = Beam(level[b].sequence + [j], image, 0.5 * (x + y) - image, 0., 0.)
+            u, v = beam.angles(np.array([x, y]))
+            beam.lo, beam.hi = min(u, v), max(u, v)
+            following.append(beam)
+        res += following
+        level = following
+
+    stats.count("beams traced", len(res))
+    return res
+
+# ----------------------------------------------------------------------------
+
+def arrays(tree: list[Beam]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The sources, refs, lo, hi and the last wall (-1 for none) of all beams as arrays, for contains.
+    """
+    sources = np.array([beam.source for beam in tree], dtype=np.float64).reshape(-1, 2)
+    refs = np.array([beam.ref for beam in tree], dtype=np.float64).reshape(-1, 2)
+    lo = np.array([beam.lo for beam in tree], dtype=np.float64)
+    hi = np.array([beam.hi for beam in tree], dtype=np.float64)
+    block = np.array([beam.sequence[-1] if beam.sequence else -1 for beam in tree], dtype=np.int64)
+    return sources, refs, lo, hi, block
+
+# ----------------------------------------------------------------------------
+
+def contains(walls: WallIndex, reciever: Point, beams: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    """
+    Which beams contain the reciever: the direction to it is between lo and hi, the reciever is behind
+    the window and there is no wall in between. All beams at once, with the arrays of arrays(tree).
+    """
+    sources, refs, lo, hi, block = beams
+    r = np.array(reciever.value[:2], dtype=np.float64)
+
+    # r = source + 1 * d, the window is at t and the next wall t + y.
+    d = r - sources
+    a = np.arctan2(refs[:, 0] * d[:, 1] - refs[:, 1] * d[:, 0], refs[:, 0] * d[:, 0] + refs[:, 1] * d[:, 1])
+    t = _on(walls, block, sources, d)
+    wall, y = walls.cast(sources + t[:, None] * d, d, block)
+    return (a >= lo) & (a <= hi) & (t < 1.) & ((wall < 0) | (t + y >= 1.))
+
+# ----------------------------------------------------------------------------
+
+def heard(walls: list[Line] | WallIndex, reciever: Point, tree: list[Beam]) -> list[tuple[Vector, str]]:
+    """
+    The beams of beam_tree, which contain the reciever. Their sources are the image points, no radius needed.
+
+    :return: (position, label) pairs like in Engine.images, with the position seen from the reciever.
+    :rtype: list[tuple[Vector, str]]
+    """
+    walls = room(walls)
+    ok = contains(walls, reciever, arrays(tree))
+
+    res = []
+    labels = set()
+    for i in np.flatnonzero(ok):
+        label = make_label([j + 1 for j in tree[i].sequence], len(walls))
+        if label in labels:
+            continue
+        labels.add(label)
+        res.append((Vector(reciever, Point(tree[i].source.tolist())), label))
+    return res
@@ -0,0 +1,199 @@
+from objects.vector import Vector
+from objects.line import Line
+from objects.point import Point
+from objects.ray import Ray
+from objects.batch import RayBatch
+from objects.distances import EDM, DistanceIndex
+import objects.analytics as analysis
+import numpy as np
+import platform
+import json
+import time
+import sys
+import os
+
+
+SEED = 20003 # every random input of the benchmarks comes from this seed.
+
+# ----------------------------------------------------------------------------
+
+def room() -> tuple[list[Line], Point, tuple[Point, float]]:
+    """
+    The fixed triangle of Engine.generate with its sender and reciever, so the numbers
+    don't depend on anything random.
+    """
+    base = Line(Point([-7.122, -16.432]), Vector(Point([0.,0.]), Point([20.891, -2.432])))
+    right = Line(Point([10.,15.]), Vector(Point([0.,0.]), Point([25.879, -41.891])))
+    left = Line(Point([-23.758, 0.453]), Vector(Point([0.,0.]), Point([4.499, 9.175])))
+    return [base, right, left], Point([-3.123, 19.543]), (Point([0., 0.]), 0.0125)
+
+# ----------------------------------------------------------------------------
+
+def timed(f, repeat: int = 3) -> float:
+    """
+    Best time of repeat calls of f in seconds, the best one is the least disturbed by the machine.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+# ----------------------------------------------------------------------------
+
+def fresh_walls(walls: list[Line]):
+    """
+    Empties the image points of the walls, so every repetition does the same work.
+    """
+    for w in walls:
+        w.images = {}
+
+# ----------------------------------------------------------------------------
+
+def bench_intersection(amount: int) -> float:
+    """
+    Line.intersection of amount random lines with every wall and with the reciever circle.
+    """
+    walls, _, reciever = room()
+    rng = np.random.default_rng(SEED)
+    lines = []
+    for a, d in zip(rng.uniform(-20., 20., (amount, 2)), rng.uniform(-1., 1., (amount, 2))):
+        lines.append(Vector(Point(a.tolist()), Point((a + d).tolist())).extend())
+
+    def f():
+        for l in lines:
+            for w in walls:
+                w.intersection(l)
+            l.intersection(reciever)
+    return timed(f)
+
+# ----------------------------------------------------------------------------
+
+def bench_expand(rounds: int, order: int) -> float:
+    """
+    Ray.expand for a fan of rounds rays, like Engine.sound_events without plots.
+    """
+    walls, sender, reciever = room()
+    angles = 2 * np.pi * np.arange(rounds) / rounds
+
+    def f():
+        fresh_walls(walls)
+        for x in angles:
+            ray = Ray(Vector(sender, Point([sender.value[0] + np.cos(x), sender.value[1] + np.sin(x)])), order)
+            ray.expand(walls, reciever, False)
+    return timed(f, 1)
+
+# ----------------------------------------------------------------------------
+
+def bench_batch(rounds: int, order: int) -> float:
+    """
+    The same fan with RayBatch, like Engine.batch_sound_events without plots.
+    """
+    walls, sender, reciever = room()
+
+    def f():
+        fresh_walls(walls)
+        RayBatch.sweep(sender, rounds, order).expand(walls, reciever)
+    return timed(f)
+
+# ----------------------------------------------------------------------------
+
+def bench_edm(points: int) -> tuple[float, float]:
+    """
+    Engine.create_edm and Engine.compare_point_pair_distances for random image points,
+    spread over the same area as the images of a high order run.
+    """
+    rng = np.random.default_rng(SEED)
+    p = rng.uniform(-300., 300., (points, 2))
+    labels = ["I" + str(i) for i in range(points)]
+    edm = EDM(labels, p)
+    return timed(lambda: EDM(labels, p)), timed(lambda: DistanceIndex(edm).groups(0.1))
+
+# ----------------------------------------------------------------------------
+
+def bench_analytics(order: int, rounds: int) -> tuple[float, int]:
+    """
+    analytics.split_dictionary_with_flags on the distance groups of a fixed run.
+    Returns the time and the amount of pairs in the groups.
+    """
+    walls, sender, reciever = room()
+    batch = RayBatch.sweep(sender, rounds, order)
+    batch.expand(walls, reciever)
+    images = batch.images(reciever)
+    edm = EDM.create(images)
+    keys, pairs, bounds = DistanceIndex(edm).groups(0.1)
+    data = {}
+    for g, k in enumerate(keys.tolist()):
+        data[k] = [(images[i][1], images[j][1]) for i, j in pairs[bounds[g]:bounds[g + 1]].tolist()]
+
+    def f():
+        analysis.shredded.cache_clear()
+        analysis.split_dictionary_with_flags(data)
+    return timed(f), len(pairs)
+
+# ----------------------------------------------------------------------------
+
+def run(quick: bool = False, callback=None) -> dict:
+    """
+    Runs every benchmark with its scaling curve and collects the results.
+
+    :param quick: Smaller sizes, only a check that everything still runs.
+    :type quick: bool
+    :param callback: Called with every measurement (see the results), as soon as it is taken, nothing if None.
+    :type callback: Callable[[dict], None]
+    :return: The machine, the seed and one entry per measurement: stage, parameters and seconds.
+    :rtype: dict
+    """
+    rays = [1000, 4000, 16000] if not quick else [500]
+    orders = [2, 5, 10, 15] if not quick else [2, 5]
+    points = [100, 500, 2000] if not quick else [100]
+
+    results = []
+    def add(stage: str, seconds: float, **parameters):
+        results.append({"stage": stage, **parameters, "seconds": seconds})
+        if callback is not None:
+            callback(results[-1])
+
+    for n in rays:
+        add("intersection", bench_intersection(n), lines=n)
+    for n in rays:
+        add("expand", bench_expand(n, 5), rays=n, order=5)
+        add("batch", bench_batch(n, 5), rays=n, order=5)
+    for o in orders:
+        add("expand", bench_expand(rays[0], o), rays=rays[0], order=o)
+        add("batch", bench_batch(rays[-1], o), rays=rays[-1], order=o)
+    for n in points:
+        edm, groups = bench_edm(n)
+        add("edm", edm, points=n)
+        add("groups", groups, points=n)
+    # with less rays hardly any image points are found and there is nothing to group,
+    # so the analytics always take the largest fan and only the orders change.
+    for o in orders if not quick else [5]:
+        seconds, pairs = bench_analytics(o, 16000)
+        add("analytics", seconds, order=o, pairs=pairs)
+
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "seed": SEED,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    # python -m objects.bench [output.json] [--quick], from the top folder.
+    # Compare two runs with the same stage and parameters.
+    # Without a path it goes into output/, which is not tracked, with the time in the name.
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    res = run("--quick" in sys.argv, lambda r: print(r["stage"], {k: v for k, v in r.items() if k not in ("stage", "seconds")}, f"{r['seconds']:.4f}s"))
+    if args:
+        path = args[0]
+    else:
+        os.makedirs("output", exist_ok=True)
+        path = os.path.join("output", "bench-" + res["time"].replace(":", "") + ".json")
+    with open(path, "w") as f:
+        json.dump(res, f, indent=1)
+    print("written to", path)
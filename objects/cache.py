@@ -0,0 +1,112 @@
+from objects.distances import EDM
+from objects.scenarios import Scenario, Result
+import numpy as np
+import hashlib
+import os
+
+
+def key(scenario: Scenario, **parameters) -> str:
+    """
+    Content address of a scenario: a hash over the exact coordinates of the walls, sender and reciever,
+    the order, the radius and any further parameters (method, rounds, decimals ...).
+    The floats are hashed with float.hex, so only the very same scene gives the same key.
+    """
+    parts = []
+    for w in scenario.walls:
+        parts += [float(x).hex() for x in list(w.anchor.value) + list(w.direction.value)]
+    parts.append("|")
+    parts += [float(x).hex() for x in list(scenario.sender.value) + list(scenario.reciever.value)]
+    parts += ["|", str(scenario.order), float(scenario.radius).hex()]
+    for k in sorted(parameters):
+        parts += ["|", k, repr(parameters[k])]
+    return hashlib.sha256(" ".join(parts).encode()).hexdigest()
+
+# ----------------------------------------------------------------------------
+
+
+class ResultCache:
+    """
+    Results of scenarios on disk, one npz file per key, so they survive the process.
+    When the folder grows above limit bytes, the results, which were used the longest time ago, are removed.
+    """
+    def __init__(self, folder: str, limit: int = 256 * 1024 * 1024):
+        self.folder = folder
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+        self.total = self.size() # running size of the folder, so put doesn't look at every file.
+
+    # ------------------------------------------------------------------------
+
+    def path(self, k: str) -> str:
+        return os.path.join(self.folder, k + ".npz")
+
+    # ------------------------------------------------------------------------
+
+    def get(self, k: str) -> Result:
+        """
+        The stored result of the key, None if there is none.
+        """
+        path = self.path(k)
+        try:
+            with np.load(path) as f:
+                labels = f["labels"].tolist()
+                # seen are the points from the reciever, like in the EDM of Result.create.
+                edm = EDM(labels, f["seen"], values=f["values"])
+                res = Result(f["points"], labels, edm, f["keys"], f["pairs"], f["bounds"])
+        except (OSError, KeyError, ValueError):
+            # missing, only half written by a process, which was killed, or from before seen was stored.
+            self.misses += 1
+            return None
+
+        # the modification time marks the last use for the eviction.
+        os.utime(path)
+        self.hits += 1
+        return res
+
+    # ------------------------------------------------------------------------
+
+    def put(self, k: str, result: Result):
+        """
+        Stores a result and evicts old ones, if the folder got too large.
+        """
+        path = self.path(k)
+        old = os.path.getsize(path) if os.path.exists(path) else 0
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, labels=np.array(result.labels, dtype=str), points=result.points, seen=result.edm.points, values=result.edm.values,
+                     keys=result.keys, pairs=result.pairs, bounds=result.bounds)
+        os.replace(path + ".tmp", path)
+        self.total += os.path.getsize(path) - old
+        if self.total > self.limit:
+            self.evict()
+
+    # ------------------------------------------------------------------------
+
+    def evict(self):
+        """
+        Removes the least recently used results, until the folder is below 90% of the limit again.
+        Only called, when the running total crosses the limit, and then it makes some room,
+        so the folder is only listed once in a while and not on every put.
+        It also corrects the running total, in case other processes use the same folder.
+        """
+        entries = []
+        for f in os.listdir(self.folder):
+            if f.endswith(".npz"):
+                stat = os.stat(os.path.join(self.folder, f))
+                entries.append((stat.st_mtime, stat.st_size, f))
+        total = sum(e[1] for e in entries)
+        for _, size, f in sorted(entries):
+            if total <= 0.9 * self.limit:
+                break
+            os.remove(os.path.join(self.folder, f))
+            total -= size
+        self.total = total
+
+    # ------------------------------------------------------------------------
+
+    def size(self) -> int:
+        """
+        Bytes of all the stored results.
+        """
+        return sum(os.path.getsize(os.path.join(self.folder, f)) for f in os.listdir(self.folder) if f.endswith(".npz"))
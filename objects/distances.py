@@ -0,0 +1,260 @@
+from objects.vector import Vector
+import numpy as np
+import math
+
+
+def edm(points: np.ndarray) -> np.ndarray:
+    """
+    The euclidean distance matrix of the given points as float array, without any labels.
+
+    :param points: Coordinates with shape (n, 2).
+    :type points: np.ndarray
+    :return: Distances with shape (n, n).
+    :rtype: np.ndarray
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    dx = points[:, 0][:, None] - points[:, 0][None, :]
+    dy = points[:, 1][:, None] - points[:, 1][None, :]
+    # pow like abs(Vector), so the values are the same as in Engine.create_edm.
+    return np.sqrt(np.float_power(dx, 2) + np.float_power(dy, 2))
+
+# ----------------------------------------------------------------------------
+
+def condensed(points: np.ndarray, block: int = 512) -> np.ndarray:
+    """
+    The upper triangle of the euclidean distance matrix (without the diagonal), row by row,
+    like scipy's condensed form. Only block rows are computed at once, so the memory stays
+    at about block * n floats, even for thousands of image points.
+
+    :param points: Coordinates with shape (n, 2).
+    :type points: np.ndarray
+    :param block: Amount of rows computed at once.
+    :type block: int
+    :return: Distances with shape (n * (n - 1) / 2,).
+    :rtype: np.ndarray
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    n = len(points)
+    res = np.empty(n * (n - 1) // 2, dtype=np.float64)
+    pos = 0
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        rows = points[start:stop]
+        dx = points[:, 0][None, :] - rows[:, 0][:, None]
+        dy = points[:, 1][None, :] - rows[:, 1][:, None]
+        d = np.sqrt(np.float_power(dx, 2) + np.float_power(dy, 2))
+
+        # only the columns right of the diagonal, still row by row.
+        upper = np.arange(n)[None, :] > np.arange(start, stop)[:, None]
+        values = d[upper]
+        res[pos:pos + len(values)] = values
+        pos += len(values)
+    return res
+
+# ----------------------------------------------------------------------------
+
+class EDM:
+    """
+    Euclidean distance matrix of labelled points, only the condensed upper triangle is stored.
+    The labels are kept apart in their own index, so the distances stay a plain float array.
+    edm[i, j] works like on the full matrix, table gives the old labelled list of lists.
+    """
+    __slots__ = ("labels", "points", "values", "index", "_rows")
+
+    def __init__(self, labels: list[str], points: np.ndarray, block: int = 512, values: np.ndarray = None):
+        assert len(labels) == len(points)
+        self.labels = labels
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        # values are only passed in, if they were computed before (see objects/cache.py).
+        self.values = condensed(self.points, block) if values is None else np.asarray(values, dtype=np.float64)
+        self.index = {l: i for i, l in enumerate(labels)} # label: row
+        n = len(labels)
+        rows = np.arange(n, dtype=np.int64)
+        self._rows = n * rows - rows * (rows + 1) // 2 # position of each row in values
+
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def create(cls, images: list[tuple[Vector, str]], block: int = 512) -> "EDM":
+        """
+        The matrix of (position, label) pairs like in Engine.images.
+        """
+        points = np.array([p.value for p, _ in images], dtype=np.float64).reshape(-1, 2)
+        return cls([l for _, l in images], points, block)
+
+    # ------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    # ------------------------------------------------------------------------
+
+    def __getitem__(self, key: tuple) -> float:
+        """
+        The distance between the rows i and j, or between two labels.
+        """
+        i, j = key
+        if isinstance(i, str):
+            i = self.index[i]
+        if isinstance(j, str):
+            j = self.index[j]
+        if i == j:
+            return 0.
+        if i > j:
+            i, j = j, i
+        return float(self.values[self._rows[i] + j - i - 1])
+
+    # ------------------------------------------------------------------------
+
+    def pairs(self, k: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Turns positions in values back into rows i and columns j, with i < j.
+        """
+        k = np.asarray(k, dtype=np.int64)
+        i = np.searchsorted(self._rows, k, side="right") - 1
+        return i, k - self._rows[i] + i + 1
+
+    # ------------------------------------------------------------------------
+
+    def square(self) -> np.ndarray:
+        """
+        The full (n, n) matrix, only for small amounts of points.
+        """
+        n = len(self)
+        res = np.zeros((n, n), dtype=np.float64)
+        i, j = np.triu_indices(n, k=1)
+        res[i, j] = self.values
+        res[j, i] = self.values
+        return res
+
+    # ------------------------------------------------------------------------
+
+    def table(self) -> list[list]:
+        """
+        Compatibility view for printing, the labels in row and column 0, like the old Engine.edm.
+        """
+        res = [[" "] + list(self.labels)]
+        for i, row in enumerate(self.square().tolist()):
+            res.append([self.labels[i]] + row)
+        return res
+
+# ----------------------------------------------------------------------------
+
+class DistanceIndex:
+    """
+    The distances of an EDM sorted once, so pairs with about the same distance are next to each other.
+    Instead of fixed buckets (round_up), every group starts at its smallest distance and takes all the
+    distances up to tolerance above it. So nearly equal distances aren't split at a bucket edge and
+    no group is ever wider than tolerance.
+    """
+    __slots__ = ("matrix", "order", "sorted")
+
+    def __init__(self, matrix: EDM):
+        self.matrix = matrix
+        self.order = np.argsort(matrix.values, kind="stable") # position in matrix.values of each sorted entry
+        self.sorted = matrix.values[self.order]
+
+    # ------------------------------------------------------------------------
+
+    def within(self, distance: float, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        All the pairs (i, j) with |edm[i, j] - distance| <= tolerance, in the order of the edm.
+        """
+        lo = np.searchsorted(self.sorted, distance - tolerance, side="left")
+        hi = np.searchsorted(self.sorted, distance + tolerance, side="right")
+        return self.matrix.pairs(np.sort(self.order[lo:hi]))
+
+    # ------------------------------------------------------------------------
+
+    def groups(self, tolerance: float, decimals: int = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Splits the sorted distances into windows of width tolerance, each one starts at the first distance
+        after the last window. Only the groups with more than one pair are kept, singletons are skipped
+        without ever building them.
+
+        :param tolerance: Largest difference between two distances in the same group.
+        :type tolerance: float
+        :param decimals: The keys are the first distance of each group rounded up to the decimals,
+                         like round_up and the recorded data. Enough for the tolerance, if it isn't given.
+        :type decimals: int
+        :return: the key of each group, the index pairs (i, j) of all groups one after another
+                 (each group in the order of the edm) and the start of each group in pairs
+                 (with the end as last entry), like pair_groups.
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        if decimals is None:
+            decimals = max(0, math.ceil(-math.log10(tolerance)))
+
+        # where the window of each distance ends. 1.1 - 1.0 is a bit more than 0.1 as float,
+        # so the tolerance gets a tiny bit of slack, 1.0 and 1.1 are in the same group.
+        n = len(self.sorted)
+        following = np.searchsorted(self.sorted, self.sorted + tolerance * (1. + 1e-9), side="right").tolist()
+        starts = []
+        i = 0
+        while i < n:
+            starts.append(i)
+            i = following[i]
+        starts = np.array(starts, dtype=np.int64)
+        ends = np.append(starts[1:], n).astype(np.int64)
+        keep = ends - starts > 1
+        starts, ends = starts[keep], ends[keep]
+        counts = ends - starts
+        bounds = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        # all members at once, sorted inside of their group by their position in the edm.
+        group = np.repeat(np.arange(len(starts)), counts)
+        members = self.order[np.repeat(starts - bounds[:-1], counts) + np.arange(bounds[-1])]
+        members = members[np.lexsort((members, group))]
+        pairs = np.stack(self.matrix.pairs(members), axis=1)
+        factor = 10 ** decimals
+        return np.ceil(self.sorted[starts] * factor) / factor, pairs, bounds
+
+# ----------------------------------------------------------------------------
+
+def pair_groups(matrix: EDM, decimals: int, tolerance: float = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The distances, which more than one pair of points share, in a compact form.
+    The same grouping as Engine.compare_point_pair_distances (DistanceIndex.groups), so the
+    batch results and the Engine always agree.
+
+    :param matrix: Distance matrix.
+    :type matrix: EDM
+    :param decimals: The tolerance is one step of the last decimal, if it isn't given.
+    :type decimals: int
+    :param tolerance: Largest difference between two distances in the same group.
+    :type tolerance: float
+    :return: the key of each group (rounded up to the decimals), the index pairs (i, j) of all groups one after another
+             and the start of each group in pairs (with the end as last entry).
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+    if tolerance is None:
+        tolerance = 10 ** -decimals
+    return DistanceIndex(matrix).groups(tolerance, decimals)
+
+# ----------------------------------------------------------------------------
+
+def labelled(labels: list[str], keys: np.ndarray, pairs: np.ndarray, bounds: np.ndarray) -> dict[float, list[tuple[str, str]]]:
+    """
+    Turns the compact groups of pair_groups into the dictionary of Engine.distance_pairs.
+    Groups with the same key (only for a tolerance below the decimals) share one entry.
+    """
+    res = {}
+    for g, key in enumerate(keys):
+        res.setdefault(float(key), []).extend((labels[a], labels[b]) for a, b in pairs[bounds[g]:bounds[g + 1]].tolist())
+    return res
+
+# ----------------------------------------------------------------------------
+
+def groups(matrix: EDM, decimals: int) -> dict[float, list[tuple[str, str]]]:
+    """
+    Engine.compare_point_pair_distances without an Engine, so only the distances,
+    which more than one pair of image points share.
+
+    :param matrix: Distance matrix with the labels.
+    :type matrix: EDM
+    :param decimals: The tolerance is one step of the last decimal.
+    :type decimals: int
+    :return: first distance of the group rounded up to the decimals: list of label pairs.
+    :rtype: dict[float, list[tuple[str, str]]]
+    """
+    return labelled(matrix.labels, *pair_groups(matrix, decimals))
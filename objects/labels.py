@@ -0,0 +1,37 @@
+"""
+The labels of the image points: I and the walls (counted from 1) the sound was reflected of, in order.
+Only strings, so everything working on the labels (analytics, rir) doesn't need the geometry.
+"""
+
+
+SEPARATOR = "-" # in front of every wall in rooms with more than 9 walls.
+
+# ----------------------------------------------------------------------------
+
+def make_label(reflections, walls: int = 9) -> str:
+    """
+    The label of an image point: I and the walls (counted from 1) it was reflected of, in order.
+    The format depends on the room, not on the label: in rooms with more than 9 walls every number
+    gets a "-" in front (I-1-12-3), else I12 could be wall 12 or the walls 1 and 2.
+
+    :param reflections: The walls of the reflections, like the logger of a Ray without the reciever.
+    :param walls: Amount of walls of the room.
+    :type walls: int
+    :return: The label, the same as always for rooms with up to 9 walls.
+    :rtype: str
+    """
+    reflections = [str(x) for x in reflections]
+    if walls > 9:
+        return "I" + "".join(SEPARATOR + x for x in reflections)
+    assert all(len(x) == 1 for x in reflections), "wall number larger than the room"
+    return "I" + "".join(reflections)
+
+# ----------------------------------------------------------------------------
+
+def reflections(label: str) -> tuple[int, ...]:
+    """
+    The walls of a label of make_label, the other way around.
+    """
+    if SEPARATOR in label:
+        return tuple(int(x) for x in label[2:].split(SEPARATOR))
+    return tuple(int(c) for c in label[1:])
@@ -13,10 +13,51 @@ class Line:
     Creates a line of following structure:
     (p0,p1) + t * {r0,r1}
     """
+    __slots__ = ("anchor", "direction", "_images", "_seen", "_normal", "_reflection")
+
     def __init__(self, anchor: Point, direction: Vector):
         self.anchor = anchor
         self.direction = direction 
-        self.images: dict[int, list[Point]] = {} # stores all the imaginary points depending on their reflection order.
+        self._images = None # only walls need the hashmap, so it is created on first use.
+        self._seen = None # the coordinates in images as tuples, so checking for doubles is cheap, created with _images.
+        self._normal = None # cache for the unit normal.
+        self._reflection = None # cache for the mirroring as affine transform.
+    
+    # ------------------------------------------------------------------------
+
+    @property
+    def images(self) -> dict[int, list[Point]]:
+        """
+        Stores all the imaginary points depending on their reflection order.
+        """
+        if self._images is None:
+            self._images = {}
+        return self._images
+
+    @images.setter
+    def images(self, images: dict[int, list[Point]]):
+        self._images = images
+        self._seen = {o: set(tuple(p.value) for p in points) for o, points in images.items()}
+
+    # ------------------------------------------------------------------------
+
+    def register(self, anchor: Point, order: int):
+        """
+        Adds an image point to the walls hashmap, if it is not in there already.
+
+        :param anchor: The image point.
+        :type anchor: Point
+        :param order: The order of reflection, which created it.
+        :type order: int
+        """
+        key = tuple(anchor.value)
+        if self._seen is None:
+            self._seen = {}
+        seen = self._seen.setdefault(order, set())
+        if key in seen:
+            return
+        seen.add(key)
+        self.images.setdefault(order, []).append(anchor)
     
     # ------------------------------------------------------------------------
 
@@ -91,13 +132,15 @@ class Line:
             # we have to intersections.
             else:
                 # compute the distances to the anchor, so the sender or the last reflection point.
+                # The squares are enough for comparing, so no Vector objects are needed.
                 inter1 = self.point(t1)
                 inter2 = self.point(t2)
-                v1 = Vector(inter1, self.anchor)
-                v2 = Vector(inter2, self.anchor)
+                a = self.anchor.value
+                d1 = (a[0] - inter1.value[0]) ** 2 + (a[1] - inter1.value[1]) ** 2
+                d2 = (a[0] - inter2.value[0]) ** 2 + (a[1] - inter2.value[1]) ** 2
 
                 # return the closest.
-                if abs(v1) < abs(v2):
+                if d1 < d2:
                     return inter1
                 else:
                     return inter2
@@ -108,11 +151,11 @@ class Line:
         if isinstance(other, Vector):
             ext = other.extend()
         
-        # for simplicity define the values real quick (we have enough memory)!
-        r = [self.direction.value[0], self.direction.value[1]]
-        s = [ext.direction.value[0], ext.direction.value[1]]
-        p = [self.anchor.value[0], self.anchor.value[1]]
-        q = [ext.anchor.value[0], ext.anchor.value[1]]
+        # for simplicity define the values real quick, without copying.
+        r = self.direction.value
+        s = ext.direction.value
+        p = self.anchor.value
+        q = ext.anchor.value
              
         # This is the divisor, which happens to be the determinant of the matrix (don't know why).
         det = (r[1] * s[0]) - (r[0] * s[1])
@@ -140,59 +183,55 @@ class Line:
 
     # ------------------------------------------------------------------------
     
-    def perp_point(self, p: Point, show: bool = False) -> Point:
+    def normal(self) -> tuple[float, float]:
         """
-        A more complex method, but easy to compute. It finds the point on the line, which 
-        is perpendicular to the given point p.
-        
-        :param self: The line we look at
-        :param p: The point we want the perpendicular to.
-        :type p: Point
-        :param show: Add to the plot.
-        :type show: bool
-        :return: A point on the line with the wished behaviour.
-        :rtype: Point
+        The unit normal of the line, so the direction turned by 90° and with length 1.
+        Computed once, because walls never move.
         """
-        # Shorter versions for the direction Vector.
-        r = [self.direction.value[0], self.direction.value[1]]
-
-        # Create two vectors, which are perpendicular to the Lines direction.
-        # In 2D this is only one possibility, but we take both directions, so n and -n.
-        # For derivation see .ipynb.
-        v1 = Vector(Point([r[1], 2 * r[0]]), Point([2 * r[1], r[0]]))
-        v2 = Vector(Point([2 * r[1], r[0]]), Point([r[1], 2 * r[0]]))
-
-        # create lines that contain p and have the given direction.
-        l1 = Line(p, v1)
-        l2 = Line(p, v2)
-
-        # compute both, because one should be None, due to the constraints in intersection method.
-        inter1 = self.intersection(l1)
-        inter2 = self.intersection(l2)
-
-
-        # only return the intersection, which is not None, and show if desired.
-        if inter1 is None:
-
-            # check if actually perpendicular.
-            assert self.angle(v2) == 0.5 * math.pi
-            # TOGGLE !!!!
-            # 
-            # 
-            if False:
-                p.plot("black", "anchor")
-                inter2.plot("grey","inter point")
-                l2.plot("green", "perp line")
-            return inter2
-        else:
+        if self._normal is None:
+            length = abs(self.direction)
+            self._normal = (-self.direction.value[1] / length, self.direction.value[0] / length)
+        return self._normal
 
-            # check if actually perpendicular.
-            assert self.angle(v1) == 0.5 * math.pi
-            if False:
-                p.plot("black", "anchor")
-                inter1.plot("grey","inter point")
-                l1.plot("green", "perp line")
-            return inter1
+    # ------------------------------------------------------------------------
+
+    def reflection(self) -> tuple[float, float, float, float, float, float]:
+        """
+        The mirroring on this line as affine transform x -> A * x + b.
+        With the unit normal n and the distance c = n * anchor of the line to the origin,
+        A = I - 2 * n * n^T and b = 2 * c * n (see .ipynb).
+
+        :return: (a00, a01, a10, a11, b0, b1)
+        :rtype: tuple[float, float, float, float, float, float]
+        """
+        if self._reflection is None:
+            n0, n1 = self.normal()
+            c = n0 * self.anchor.value[0] + n1 * self.anchor.value[1]
+            self._reflection = (1. - 2. * n0 * n0, -2. * n0 * n1,
+                                -2. * n0 * n1, 1. - 2. * n1 * n1,
+                                2. * c * n0, 2. * c * n1)
+        return self._reflection
+
+    # ------------------------------------------------------------------------
+
+    def mirror(self, x: float, y: float) -> tuple[float, float]:
+        """
+        Mirrors the point (x, y) on the line, without creating any objects.
+        """
+        a = self.reflection()
+        return (a[0] * x + a[1] * y + a[4], a[2] * x + a[3] * y + a[5])
+
+    # ------------------------------------------------------------------------
+
+    def mirror_many(self, points: np.ndarray) -> np.ndarray:
+        """
+        Mirrors a whole array of points with shape (..., 2) at once.
+        Uses the same operations as mirror, so the results are the same.
+        """
+        a = self.reflection()
+        x = points[..., 0]
+        y = points[..., 1]
+        return np.stack([a[0] * x + a[1] * y + a[4], a[2] * x + a[3] * y + a[5]], axis=-1)
 
     # ------------------------------------------------------------------------
 
@@ -212,28 +251,11 @@ class Line:
         :return: Returns a line, with the new computed direction after reflection.
         :rtype: Line
         """
-        # Compute the perpendicular Point on the wall (self)
-        p = self.perp_point(start, show)
-
-        # get the direction vector between the source and the perpendicular point p.
-        n = Vector(start, p)
-
-        # follow this point for exactly two units, one to the actual line and one to the perpendicular, imaginary
-        # position begin the vector.
-        length = abs(n)
-        normalized = n.normalized()
-        
-        # create the imaginary point.
-        anchor = Point([start.value[0] + 2 * length * normalized.value[0], start.value[1] + 2 * length * normalized.value[1]])
+        # create the imaginary point, with the precomputed mirroring of the wall.
+        anchor = Point(list(self.mirror(start.value[0], start.value[1])))
 
         # add the anchor to the walls hashmap
-        if order in self.images.keys():
-            if not anchor in self.images[order]:
-                self.images[order].append(anchor)
-        
-        else:
-            self.images[order] = [anchor]
-
+        self.register(anchor, order)
 
         direction = Vector(anchor, intersection)
         
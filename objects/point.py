@@ -5,7 +5,10 @@ class Point:
     Represents a single point in a Cartesian system of any wished dimension.
     Supports a variaty of operations like: print, addition, substraction.
     Basic methods hold for any dimension.
+    Uses slots, because rays create loads of points on every reflection.
     """
+    __slots__ = ("value",)
+
     def __init__(self, coordinates: list[float]):
         self.value = coordinates
 
@@ -33,10 +36,10 @@ class Point:
         :return: New Point
         :rtype: Point
         """
-        res = []
-        for i,_ in enumerate(self.value):
-            res.append(self.value[i] + other.value[i])
-        return Point(res)
+        # fast path for the 2D case, which is the one used in the simulation.
+        if len(self.value) == 2:
+            return Point([self.value[0] + other.value[0], self.value[1] + other.value[1]])
+        return Point([a + b for a, b in zip(self.value, other.value)])
     
     # ------------------------------------------------------------------------
     
@@ -50,10 +53,9 @@ class Point:
         :return: new Point
         :rtype: Point
         """
-        res = []
-        for i,_ in enumerate(self.value):
-            res.append(self.value[i] - other.value[i])
-        return Point(res)
+        if len(self.value) == 2:
+            return Point([self.value[0] - other.value[0], self.value[1] - other.value[1]])
+        return Point([a - b for a, b in zip(self.value, other.value)])
 
     # ------------------------------------------------------------------------
 
@@ -1,6 +1,9 @@
 from objects.vector import Vector
 from objects.line import Line
 from objects.point import Point
+from objects.walls import WallIndex
+from objects.labels import make_label
+import objects.stats as stats
 import math
 
 
@@ -17,6 +20,7 @@ class Ray:
         self.order = order
         self.recieved = False # Flag to mark, if we recieved the ray, meaning we dont want to continue anymore.
         self.logger = []
+        self.walls = 0 # amount of walls of the room, set by expand, only for the labels.
 
     # ------------------------------------------------------------------------
 
@@ -39,6 +43,11 @@ class Ray:
         if self.expanded:
             return self.values
         self.expanded = True
+        self.walls = len(walls)
+
+        # finite walls have their own loop, which only looks at the walls along the way.
+        if isinstance(walls, WallIndex):
+            return self._segments(walls, reciever, show)
 
         prev = None # saving the previous intersection point, because it will be the new anchor.
         block = -1 # flag for blocking reflection of the same wall twice in a row.
@@ -68,28 +77,29 @@ class Ray:
                 self.recieved = True
                 
             
-            # saving each intersecting vector and its distance as a deciding metric.
-            vecs = []
+            # saving the distance of each intersection as a deciding metric.
+            # Only the length is needed, so no Vector objects are created here.
+            a = curr.anchor.value
+            back = None if prev is None else math.sqrt((prev.value[0] - a[0]) ** 2 + (prev.value[1] - a[1]) ** 2)
             dist = []
-            for i, inter in enumerate(intersections):
+            for inter in intersections:
 
                 # If there was an intersection
                 if not inter is None:
 
-                    # create the vector measure its distance.
-                    vecs.append(Vector(curr.anchor, inter))
-                    dist.append(abs(vecs[i]))
+                    # measure its distance.
+                    d = math.sqrt((inter.value[0] - a[0]) ** 2 + (inter.value[1] - a[1]) ** 2)
 
                     # guarding a special case, because lines/walls are infinit and a reflection can happen with
                     # a wall ouside of the body.
                     # There for the distance needs to be atleast to the previous intersection, to enter the 
                     # figure again.
-                    if (not prev is None) and abs(vecs[i]) <= abs(Vector(curr.anchor, prev)):
-                        dist[i] = math.inf
+                    if (not back is None) and d <= back:
+                        d = math.inf
+                    dist.append(d)
                 
                 # No interscection, then add infinity, so it is overlooked.
                 else:
-                    vecs.append(None)
                     dist.append(math.inf)
             
             # take the closest legal intersecton
@@ -103,7 +113,7 @@ class Ray:
                 new_line = None
             
             else:
-                int_point = walls[m].intersection(curr)
+                int_point = intersections[m] # the same as walls[m].intersection(curr)
                 new_line = walls[m].image(int_point, curr.anchor, show, o) # the line
         
 
@@ -123,12 +133,73 @@ class Ray:
             if self.recieved:
                 break
         
+        # counted from the result, so the loop itself doesn't pay anything for the instrumentation.
+        if stats.ENABLED:
+            steps = len(self.values)
+            stats.count("wall intersections tested", steps * len(walls) - max(steps - 1, 0)) # one wall is blocked after the first step.
+            stats.count("reciever tests", steps)
+            stats.count("reflections computed", steps - 1 if self.recieved else steps)
+            stats.count("reciever hits" if self.recieved else "rays discarded")
+
         # if we are done, we return and save our computed values.
         self.expanded = True
         return self.values
     
     # ------------------------------------------------------------------------
 
+    def _segments(self, walls: WallIndex, reciever: tuple[Point, float], show: bool = False) -> list[Vector]:
+        """
+        expand for finite walls. Each step asks the WallIndex for the first wall from the current point on,
+        so there is no need to compute every wall and guard against the ones outside of the room.
+        The reciever only counts between the current point and that wall.
+        A ray, which leaves the room through a gap, just ends there.
+        """
+        prev = None
+        block = -1
+        tested = 0 # walls tested by the WallIndex, only for the counters.
+        self.value = self.value.extend()
+
+        for o in range(0, self.order + 1):
+            curr = self.value
+            start = curr.anchor if prev is None else prev
+            d = curr.direction.value
+            m, t, k = walls.first(start.value[0], start.value[1], d[0], d[1], block)
+            tested += k
+
+            # intersection with reciever, but only on the way to the wall.
+            inter = curr.intersection(reciever)
+            if not inter is None:
+                tc = ((inter.value[0] - start.value[0]) * d[0] + (inter.value[1] - start.value[1]) * d[1]) / (d[0] ** 2 + d[1] ** 2)
+                self.recieved = 0 < tc <= t
+
+            if self.recieved:
+                m = len(walls) # the reciever is the column after the walls, like above.
+                int_point = inter
+            elif m < 0:
+                break
+            else:
+                int_point = Point([start.value[0] + t * d[0], start.value[1] + t * d[1]])
+
+            block = m
+            self.logger.append(m + 1)
+            self.values.append(Vector(start, int_point))
+            new_line = None if self.recieved else walls[m].image(int_point, curr.anchor, show, o)
+
+            prev = int_point
+            self.value = new_line
+            if self.recieved:
+                break
+
+        if stats.ENABLED:
+            stats.count("wall intersections tested", tested)
+            stats.count("reciever tests", len(self.values))
+            stats.count("reflections computed", len(self.values) - 1 if self.recieved else len(self.values))
+            stats.count("reciever hits" if self.recieved else "rays discarded")
+
+        return self.values
+
+    # ------------------------------------------------------------------------
+
     def plot(self, color: str = "black", name: str = ""):
         """
         Plots the ray with all its reflections, if they exist.
@@ -145,7 +216,7 @@ class Ray:
     
     # ------------------------------------------------------------------------
 
-    def pov(self, reciever: tuple[Point, float], color: str = "orange", name: str = "", labelling: bool = True) -> tuple[Vector, str]:
+    def pov(self, reciever: tuple[Point, float], color: str = "orange", name: str = "", labelling: bool = True, plotting: bool = True) -> tuple[Vector, str]:
         """
         Plotting every Point, where the reciever sees it, just using the incoming direction
         and the entire length of the ray for the plot.
@@ -157,6 +228,8 @@ class Ray:
         :type color: str
         :param name: label
         :type name: str
+        :param plotting: Add the point to the plot, False for headless runs.
+        :type plotting: bool
         """
         rec, rad = reciever
 
@@ -179,12 +252,11 @@ class Ray:
         # adding the label:
         
         if labelling:
-            label = "I"
-            for reflection in self.logger:
-                label += str(reflection)
-            label = label[:len(label) - 1]
+            # the last entry is the reciever.
+            label = make_label(self.logger[:-1], self.walls)
         
-        pov.end.plot(color, label)
+        if plotting:
+            pov.end.plot(color, label)
         
         
         return (pov, label)
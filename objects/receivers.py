@@ -0,0 +1,145 @@
+from objects.point import Point
+import numpy as np
+import math
+
+
+class ReceiverGrid:
+    """
+    Many recievers with the same radius, sorted into a uniform grid of square cells.
+    A segment is only tested against the recievers in the cells around it, so adding more
+    recievers barely changes the cost of a sweep.
+    """
+    def __init__(self, recievers: list[Point], radius: float, cell: float = None):
+        assert len(recievers) > 0
+        self.recievers = recievers
+        self.points = np.array([r.value for r in recievers], dtype=np.float64)
+        self.radius = radius
+
+        # cells at least as large as the circles, otherwise about one reciever per cell.
+        lower = self.points.min(axis=0)
+        upper = self.points.max(axis=0)
+        if cell is None:
+            area = max((upper[0] - lower[0]) * (upper[1] - lower[1]), 1e-12)
+            cell = math.sqrt(area / len(recievers))
+        self.cell = max(cell, 2 * radius)
+
+        # one ring of empty cells around, so the neighbours of a cell always exist.
+        self.origin = lower - self.cell
+        self.shape = (np.floor((upper - self.origin) / self.cell).astype(np.int64) + 2)
+
+        # recievers sorted by cell, with the start of every cell, like a sparse matrix.
+        ids = self.cell_ids(self.points)
+        self.order = np.argsort(ids, kind="stable")
+        self.starts = np.searchsorted(ids[self.order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    # ------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.recievers)
+
+    # ------------------------------------------------------------------------
+
+    def cell_ids(self, points: np.ndarray) -> np.ndarray:
+        """
+        The index of the cell of each point, -1 if it is outside of the grid.
+        """
+        c = np.floor((points - self.origin) / self.cell).astype(np.int64)
+        inside = (c[:, 0] >= 0) & (c[:, 1] >= 0) & (c[:, 0] < self.shape[0]) & (c[:, 1] < self.shape[1])
+        return np.where(inside, c[:, 0] * self.shape[1] + c[:, 1], -1)
+
+    # ------------------------------------------------------------------------
+
+    def candidates(self, starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        All pairs of segment and reciever, which are close enough to be worth a test.
+        Walks along every segment in steps of half a cell and takes the 3x3 cells around each step,
+        which covers everything within one cell of the segment.
+
+        :return: segment indices and reciever indices of the pairs.
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        # only the part of the segment inside the grid is interesting, so clip the parameter range.
+        d = ends - starts
+        lo = np.zeros(len(d))
+        hi = np.ones(len(d))
+        for k in range(2):
+            left = self.origin[k]
+            right = self.origin[k] + self.shape[k] * self.cell
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t1 = (left - starts[:, k]) / d[:, k]
+                t2 = (right - starts[:, k]) / d[:, k]
+            flat = d[:, k] == 0.
+            outside = flat & ((starts[:, k] < left) | (starts[:, k] > right))
+            lo = np.where(flat, lo, np.maximum(lo, np.minimum(t1, t2)))
+            hi = np.where(flat, hi, np.minimum(hi, np.maximum(t1, t2)))
+            hi = np.where(outside, -1., hi)
+        seg = np.flatnonzero(hi >= lo)
+        if len(seg) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # sample points along the clipped segments.
+        length = np.sqrt(d[seg, 0] ** 2 + d[seg, 1] ** 2) * (hi[seg] - lo[seg])
+        counts = np.ceil(length / (0.5 * self.cell)).astype(np.int64) + 1
+        owner = np.repeat(seg, counts)
+        first = np.cumsum(counts) - counts
+        k = np.arange(counts.sum()) - np.repeat(first, counts)
+        t = np.repeat(lo[seg], counts) + (np.repeat(hi[seg] - lo[seg], counts) * k / np.repeat(np.maximum(counts - 1, 1), counts))
+        samples = starts[owner] + t[:, None] * d[owner]
+
+        # the 3x3 neighbourhood of each sample.
+        c = np.floor((samples - self.origin) / self.cell).astype(np.int64)
+        c = np.clip(c, 1, np.array(self.shape) - 2)
+        cells = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                cells.append((c[:, 0] + dx) * self.shape[1] + (c[:, 1] + dy))
+        cells = np.concatenate(cells)
+        owner = np.tile(owner, 9)
+
+        # only cells with recievers, most of them are empty.
+        full = self.starts[cells + 1] > self.starts[cells]
+        owner, cells = owner[full], cells[full]
+
+        # every (segment, cell) pair only once.
+        key = np.unique(owner * (self.shape[0] * self.shape[1]) + cells)
+        owner = key // (self.shape[0] * self.shape[1])
+        cells = key % (self.shape[0] * self.shape[1])
+        amount = self.starts[cells + 1] - self.starts[cells]
+
+        # expand to one pair per reciever in the cell.
+        pos = np.repeat(self.starts[cells], amount) + (np.arange(amount.sum()) - np.repeat(np.cumsum(amount) - amount, amount))
+        return np.repeat(owner, amount), self.order[pos]
+
+    # ------------------------------------------------------------------------
+
+    def hits(self, starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Tests the segments from starts to ends against the circles of the recievers around them.
+
+        :param starts: Start points of the segments, shape (n, 2).
+        :type starts: np.ndarray
+        :param ends: End points of the segments, shape (n, 2).
+        :type ends: np.ndarray
+        :return: segment indices, reciever indices and the points, where the segments enter the circles.
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        seg, rec = self.candidates(starts, ends)
+
+        # circle formula like in Line.intersection, but the segment only goes from t = 0 to t = 1.
+        a = starts[seg]
+        d = ends[seg] - a
+        w = a - self.points[rec]
+        qa = d[:, 0] ** 2 + d[:, 1] ** 2
+        qb = 2 * (d[:, 0] * w[:, 0] + d[:, 1] * w[:, 1])
+        qc = w[:, 0] ** 2 + w[:, 1] ** 2 - self.radius ** 2
+        disc = qb ** 2 - 4 * qa * qc
+        with np.errstate(invalid="ignore", divide="ignore"):
+            root = np.sqrt(disc)
+            t1 = (-qb - root) / (2 * qa)
+            t2 = (-qb + root) / (2 * qa)
+        ok = (disc >= 0) & (qa > 0) & (t2 >= 0) & (t1 <= 1)
+
+        # entering the circle, or starting inside of it.
+        t = np.maximum(t1[ok], 0.)
+        points = a[ok] + t[:, None] * d[ok]
+        return seg[ok], rec[ok], points
@@ -0,0 +1,84 @@
+from objects.vector import Vector
+from objects.line import Line
+from objects.point import Point
+from objects.ray import Ray
+from objects.walls import WallIndex
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+import numpy as np
+
+
+def segments(rays: list[Ray]) -> np.ndarray:
+    """
+    All the traced segments of the rays as one array of shape (k, 2, 2), (start, end) each.
+    """
+    res = [(v.anchor.value[:2], v.end.value[:2]) for r in rays for v in r.values]
+    return np.array(res, dtype=np.float64).reshape(-1, 2, 2)
+
+# ----------------------------------------------------------------------------
+
+def wall_segments(walls: list[Line]) -> np.ndarray:
+    """
+    The same part of each wall as Line.plot draws, finite walls as they are.
+    """
+    if isinstance(walls, WallIndex):
+        return np.stack([walls.starts, walls.ends], axis=1)
+    res = []
+    for w in walls:
+        a = w.point(-20 * (1 / abs(w.direction)))
+        b = w.point(30 * (1 / abs(w.direction)))
+        res.append((a.value[:2], b.value[:2]))
+    return np.array(res, dtype=np.float64).reshape(-1, 2, 2)
+
+# ----------------------------------------------------------------------------
+
+def render(walls: list[Line], sender: Point, reciever: Point, rays: list[Ray], images: list[tuple[Vector, str]], filename: str = None, labels: bool = True, limits: tuple[float, float] = None) -> Figure:
+    """
+    Draws the same things as the show flag of Engine.sound_events, but without pyplot:
+    all ray segments in one LineCollection, the walls in another one and all the image points
+    in a single scatter. Nothing waits for a window or an input, so it also runs on machines without a display.
+
+    :param walls: The walls of the room.
+    :type walls: list[Line]
+    :param sender: Position of the sender.
+    :type sender: Point
+    :param reciever: Position of the reciever.
+    :type reciever: Point
+    :param rays: The rays to draw, usually only the recieved ones.
+    :type rays: list[Ray]
+    :param images: (position, label) pairs like in Engine.images.
+    :type images: list[tuple[Vector, str]]
+    :param filename: Where to save the figure, nothing is saved if None.
+    :type filename: str
+    :param labels: Write the label next to each image point (one text each, so the slowest part).
+    :type labels: bool
+    :param limits: Optional (low, high) for both axes, otherwise everything is visible.
+    :type limits: tuple[float, float]
+    :return: The figure, it is not attached to pyplot, so it is freed with the last reference.
+    :rtype: Figure
+    """
+    fig = Figure()
+    ax = fig.add_subplot()
+
+    ax.add_collection(LineCollection(segments(rays), colors="black", linewidths=0.5))
+    ax.add_collection(LineCollection(wall_segments(walls), colors="blue"))
+
+    points = np.array([p.end.value[:2] for p, _ in images], dtype=np.float64).reshape(-1, 2)
+    ax.scatter(points[:, 0], points[:, 1], s=30, color="orange")
+    if labels:
+        for (x, y), (_, label) in zip(points.tolist(), images):
+            ax.text(x, y, label, size=8, color="green")
+
+    ax.scatter([sender.value[0]], [sender.value[1]], s=30, color="blue")
+    ax.scatter([reciever.value[0]], [reciever.value[1]], s=30, color="cyan")
+
+    if limits is not None:
+        ax.set_xlim(*limits)
+        ax.set_ylim(*limits)
+    else:
+        ax.autoscale_view()
+    ax.set_aspect("equal", adjustable="box")
+
+    if filename is not None:
+        fig.savefig(filename)
+    return fig
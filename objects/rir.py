@@ -0,0 +1,112 @@
+"""
+Room impulse responses from the image points. Every image point is one arrival at the reciever:
+the distance to it (the entire path of the ray, see Ray.pov) gives the time, the order of reflection
+and the distance give the amplitude. All arrivals of all recievers and scenarios are sorted into
+their samples with a single np.bincount, so thousands of responses take one step.
+
+    e.sound_events(5)
+    h = e.impulse_response(16000, 0.8)
+"""
+from objects.vector import Vector
+from objects.labels import SEPARATOR
+import numpy as np
+
+
+SPEED = 343. # speed of sound in m/s, the coordinates are taken as meters.
+
+# ----------------------------------------------------------------------------
+
+def orders(labels: list[str]) -> np.ndarray:
+    """
+    The order of reflection of each label (see labels.make_label), I has order 0.
+    """
+    # rooms with more than 9 walls have a SEPARATOR in front of every wall, else every character is one.
+    labels = np.asarray(labels, dtype=str)
+    dashes = np.char.count(labels, SEPARATOR)
+    return np.where(dashes > 0, dashes, np.char.str_len(labels) - 1).astype(np.int64)
+
+# ----------------------------------------------------------------------------
+
+def gains(order: np.ndarray, attenuation: float | np.ndarray = 1.) -> np.ndarray:
+    """
+    The factor of every arrival for its order: attenuation ** order for a single reflection coefficient,
+    or attenuation[order] for a table with one factor per order (attenuation[0] for the direct sound).
+    """
+    order = np.asarray(order, dtype=np.int64)
+    if np.ndim(attenuation) == 0:
+        return np.float_power(float(attenuation), order)
+    attenuation = np.asarray(attenuation, dtype=np.float64)
+    assert len(order) == 0 or order.max() < len(attenuation), "no attenuation for the highest order"
+    return attenuation[order]
+
+# ----------------------------------------------------------------------------
+
+def responses(owner: np.ndarray, distance: np.ndarray, order: np.ndarray, count: int, rate: int = 16000,
+              attenuation: float | np.ndarray = 1., samples: int = None, speed: float = SPEED) -> np.ndarray:
+    """
+    Bins the arrivals of many responses at once. Arrival k belongs to response owner[k], arrives after
+    distance[k] / speed seconds (rounded to the nearest sample) and has the amplitude gains / distance,
+    so it falls off like the sound of a point source. Arrivals in the same sample add up.
+
+    :param owner: Response of each arrival, from 0 to count - 1.
+    :type owner: np.ndarray
+    :param distance: Length of the path of each arrival.
+    :type distance: np.ndarray
+    :param order: Order of reflection of each arrival.
+    :type order: np.ndarray
+    :param count: Amount of responses.
+    :type count: int
+    :param rate: Sample rate in Hz.
+    :type rate: int
+    :param attenuation: Reflection coefficient or one factor per order, see gains.
+    :type attenuation: float | np.ndarray
+    :param samples: Length of the responses, long enough for the latest arrival if None. Later arrivals are cut off.
+    :type samples: int
+    :param speed: Speed of sound.
+    :type speed: float
+    :return: The responses with shape (count, samples).
+    :rtype: np.ndarray
+    """
+    owner = np.asarray(owner, dtype=np.int64)
+    distance = np.asarray(distance, dtype=np.float64)
+    sample = np.rint(distance * (rate / speed)).astype(np.int64)
+    if samples is None:
+        samples = int(sample.max()) + 1 if len(sample) else 1
+
+    # the reciever has a radius, so the distance is never 0, the guard is only for made up input.
+    amplitude = gains(order, attenuation) / np.maximum(distance, 1e-9)
+    keep = sample < samples
+    flat = owner[keep] * samples + sample[keep]
+    return np.bincount(flat, weights=amplitude[keep], minlength=count * samples).reshape(count, samples)
+
+# ----------------------------------------------------------------------------
+
+def from_images(images: list[list[tuple[Vector, str]]], rate: int = 16000, attenuation: float | np.ndarray = 1.,
+                samples: int = None, speed: float = SPEED) -> np.ndarray:
+    """
+    One response for each list of (position, label) pairs, like Engine.images or each entry of Engine.heard.
+    The positions are seen from the reciever, so their length is the path of the sound.
+    """
+    amount = np.array([len(x) for x in images], dtype=np.int64)
+    values = np.array([p.value[:2] for x in images for p, _ in x], dtype=np.float64).reshape(-1, 2)
+    labels = [l for x in images for _, l in x]
+    distance = np.sqrt(values[:, 0] ** 2 + values[:, 1] ** 2)
+    owner = np.repeat(np.arange(len(images)), amount)
+    return responses(owner, distance, orders(labels), len(images), rate, attenuation, samples, speed)
+
+# ----------------------------------------------------------------------------
+
+def from_results(scenarios: list, results: list, rate: int = 16000, attenuation: float | np.ndarray = 1.,
+                 samples: int = None, speed: float = SPEED) -> np.ndarray:
+    """
+    One response for each scenario of scenarios.run, from the arrays of its Result (absolute image points).
+    Scenarios, where nothing arrived, get a row of zeros.
+    """
+    amount = np.array([len(r.labels) for r in results], dtype=np.int64)
+    points = np.concatenate([r.points for r in results] + [np.zeros((0, 2))])
+    recievers = np.array([s.reciever.value[:2] for s in scenarios], dtype=np.float64).reshape(-1, 2)
+    owner = np.repeat(np.arange(len(results)), amount)
+    d = points - recievers[owner]
+    distance = np.sqrt(d[:, 0] ** 2 + d[:, 1] ** 2)
+    labels = [l for r in results for l in r.labels]
+    return responses(owner, distance, orders(labels), len(results), rate, attenuation, samples, speed)
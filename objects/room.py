@@ -0,0 +1,114 @@
+from objects.line import Line
+from objects.point import Point
+from objects.walls import WallIndex
+import numpy as np
+import math
+
+
+class Room(WallIndex):
+    """
+    A closed polygon of walls, wall j goes from corner j to corner j + 1.
+    Every wall knows its inward normal n and offset c, so the inside of the room is n * x >= c for all walls.
+    In a convex room a ray from the inside leaves through exactly one wall: the first half-plane it crosses.
+    That is a single dot product per wall, without any intersection points or guards.
+    Everything else (concave rooms, rays from the outside) goes through the grid of WallIndex.
+    """
+    def __init__(self, corners: list[Point], cell: float = None):
+        p = np.array([q.value for q in corners], dtype=np.float64).reshape(-1, 2)
+        assert len(p) >= 3
+        super().__init__(p, np.roll(p, -1, axis=0), cell)
+        self.corners = p
+
+        # the sign of the area tells the orientation, for counter clockwise rooms the inside is on the left.
+        x, y = p[:, 0], p[:, 1]
+        area = 0.5 * np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+        assert area != 0.
+        d = self.ends - self.starts
+        n = np.stack([-d[:, 1], d[:, 0]], axis=1) * (1. if area > 0 else -1.)
+        self.normals = n / np.sqrt(n[:, 0] ** 2 + n[:, 1] ** 2)[:, None]
+        self.offsets = np.sum(self.normals * self.starts, axis=1)
+
+        # convex, if every corner is inside of all the half-planes.
+        self.scale = max(np.ptp(p[:, 0]), np.ptp(p[:, 1]))
+        self.convex = bool((self.corners @ self.normals.T - self.offsets[None, :] >= -1e-9 * self.scale).all())
+        self.planes = [(n[0], n[1], c) for n, c in zip(self.normals.tolist(), self.offsets.tolist())]
+
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def from_lines(cls, lines: list[Line], cell: float = None) -> "Room":
+        """
+        The room enclosed by infinite lines like the ones of Engine.generate, in the order they go around it.
+        Wall j lies on lines[j], so the labels of the reflections stay the same.
+        """
+        corners = []
+        for j in range(len(lines)):
+            a, b = lines[j - 1], lines[j]
+            p, r = np.array(a.anchor.value), np.array(a.direction.value)
+            q, s = np.array(b.anchor.value), np.array(b.direction.value)
+            det = r[0] * s[1] - r[1] * s[0]
+            assert det != 0., "neighbouring walls are parallel"
+            t = ((q[0] - p[0]) * s[1] - (q[1] - p[1]) * s[0]) / det
+            corners.append(Point((p + t * r).tolist()))
+        return cls(corners, cell)
+
+    # ------------------------------------------------------------------------
+
+    def contains(self, points: np.ndarray, tolerance: float = 1e-9) -> np.ndarray:
+        """
+        Which points are inside or on the walls, only meaningful for convex rooms.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return (points @ self.normals.T - self.offsets[None, :] >= -tolerance * self.scale).all(axis=1)
+
+    # ------------------------------------------------------------------------
+
+    def first(self, x: float, y: float, dx: float, dy: float, block: int = -1) -> tuple[int, float, int]:
+        """
+        cast for a single ray with plain floats: the first half-plane it leaves, if the room is convex
+        and the ray starts inside, else the walk through the grid of WallIndex.first.
+        Every wall but the blocked one counts as tested for the half-planes.
+        """
+        if not self.convex or any(nx * x + ny * y - c < -1e-9 * self.scale for nx, ny, c in self.planes):
+            return super().first(x, y, dx, dy, block)
+
+        wall, best = -1, math.inf
+        for j, (nx, ny, c) in enumerate(self.planes):
+            towards = dx * nx + dy * ny
+            if towards < 0. and j != block:
+                t = max((c - x * nx - y * ny) / towards, 0.)
+                if t < best:
+                    wall, best = j, t
+        return wall, best, len(self.planes) - (block >= 0)
+
+    # ------------------------------------------------------------------------
+
+    def cast(self, starts: np.ndarray, directions: np.ndarray, block: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        WallIndex.cast, but in a convex room the rays from the inside just take the first half-plane
+        they leave. Returns the index of the hit wall (-1 if none) and the t of the hit (inf if none).
+        """
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 2)
+        if not self.convex:
+            return super().cast(starts, directions, block)
+
+        n = len(starts)
+        block = np.full(n, -1, dtype=np.int64) if block is None else np.asarray(block, dtype=np.int64)
+        inside = self.contains(starts)
+
+        # n * (p + t * d) = c gives t for every wall, only walls the ray is moving towards count.
+        towards = directions @ self.normals.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (self.offsets[None, :] - starts @ self.normals.T) / towards
+        ok = (towards < 0.) & (np.arange(len(self))[None, :] != block[:, None])
+        t = np.where(ok, np.maximum(t, 0.), np.inf)
+        wall = np.argmin(t, axis=1)
+        best = t[np.arange(n), wall]
+        wall = np.where(np.isfinite(best), wall, -1)
+
+        # the few rays from the outside still need the grid.
+        if not inside.all():
+            out = np.flatnonzero(~inside)
+            wall[out], best[out] = super().cast(starts[out], directions[out], block[out])
+        return wall, best
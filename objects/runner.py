@@ -0,0 +1,169 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+import json
+import os
+import time
+import traceback
+import contextlib
+import io
+
+
+def grid(orders: list[int], rounds: list[int], radii: list[float]) -> list[tuple[int, int, float]]:
+    """
+    All combinations of the parameters, which were changed by hand in engine.py so far:
+    reflection_order, ROUNDS and Engine.radius.
+    """
+    return [(o, s, r) for o, s, r in product(orders, rounds, radii)]
+
+# ----------------------------------------------------------------------------
+
+def name(point: tuple[int, int, float], decimals: int = 1) -> str:
+    """
+    Name of a run and its checkpoint, like the figures in data/ (o5s20003r...), but with the exact
+    parameters: the radius with repr, which gives the float back exactly, and the decimals.
+    So two different points never share a checkpoint.
+    """
+    order, rounds, radius = point
+    return f"o{int(order)}s{int(rounds)}r{float(radius)!r}d{int(decimals)}"
+
+# ----------------------------------------------------------------------------
+
+def run_point(point: tuple[int, int, float], decimals: int = 1) -> dict:
+    """
+    A single run like the __main__ of engine.py, but with the given parameters and without plots.
+    Meant to run in its own process, so everything returned is plain values.
+
+    :param point: (reflection order, amount of rays, radius of the reciever).
+    :type point: tuple[int, int, float]
+    :param decimals: Decimals for compare_point_pair_distances.
+    :type decimals: int
+    :return: the parameters, the image points with their labels and the filtered distance pairs.
+    :rtype: dict
+    """
+    from engine import Engine
+
+    order, rounds, radius = point
+    start = time.time()
+    e = Engine()
+
+    # generate prints its random angles, which would come from every worker.
+    with contextlib.redirect_stdout(io.StringIO()):
+        e.generate()
+    e.radius = radius
+    e.batch_sound_events(order, False, rounds)
+    e.create_edm()
+    pairs = e.compare_point_pair_distances(decimals)
+
+    return {
+        "order": order,
+        "rounds": rounds,
+        "radius": radius,
+        "images": [[l, p.end.value[0], p.end.value[1]] for p, l in e.images],
+        # json only has string keys, the distances are written with repr, so they are read back exactly.
+        "pairs": {repr(k): [list(p) for p in v] for k, v in pairs.items()},
+        "seconds": time.time() - start,
+    }
+
+# ----------------------------------------------------------------------------
+
+def done(folder: str) -> set[str]:
+    """
+    Names of the runs, which already have a result in the folder. The results are the checkpoint:
+    a result is only written, when its run is finished, so everything else is done again.
+    """
+    if not os.path.isdir(folder):
+        return set()
+    return {f[:-5] for f in os.listdir(folder) if f.endswith(".json")}
+
+# ----------------------------------------------------------------------------
+
+def write(folder: str, result: dict, key: str):
+    """
+    Writes a result atomically, so an interrupted sweep never leaves half a file,
+    which would count as finished.
+    """
+    path = os.path.join(folder, key + ".json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(result, f)
+    os.replace(path + ".tmp", path)
+
+# ----------------------------------------------------------------------------
+
+def sweep(points: list[tuple[int, int, float]], folder: str, workers: int = None, decimals: int = 1, callback=None) -> list[str]:
+    """
+    Runs all the points of the grid in a process pool and writes each result into folder/<name>.json
+    as soon as it is finished. Points with a result already in the folder are skipped,
+    so an interrupted sweep just continues, when it is started again with the same folder.
+    A point, which raises, doesn't stop the others: its traceback goes into folder/<name>.err
+    and it is tried again with the next start.
+
+    :param points: The parameters, see grid.
+    :type points: list[tuple[int, int, float]]
+    :param folder: Where the results are written, created if missing.
+    :type folder: str
+    :param workers: Amount of processes, os.cpu_count() if None.
+    :type workers: int
+    :param decimals: Decimals for compare_point_pair_distances.
+    :type decimals: int
+    :param callback: Called with the name of every run and None (or the exception, if it failed),
+                     as soon as it is written, nothing if None.
+    :type callback: Callable[[str, Exception | None], None]
+    :return: The names of the runs, which were computed this time.
+    :rtype: list[str]
+    """
+    os.makedirs(folder, exist_ok=True)
+    finished = done(folder)
+
+    # every name only once, the same point twice in the grid is the same run.
+    todo = {}
+    for point in points:
+        key = name(point, decimals)
+        if key not in finished and key not in todo:
+            todo[key] = point
+
+    res = []
+    if not todo:
+        return res
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_point, point, decimals): key for key, point in todo.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            error = os.path.join(folder, key + ".err")
+            try:
+                result = future.result()
+            except Exception as x:
+                with open(error, "w") as f:
+                    f.write("".join(traceback.format_exception(x)))
+                if callback is not None:
+                    callback(key, x)
+                continue
+
+            write(folder, result, key)
+            if os.path.exists(error):
+                os.remove(error)
+            res.append(key)
+            if callback is not None:
+                callback(key, None)
+    return res
+
+# ----------------------------------------------------------------------------
+
+def load(folder: str) -> dict[str, dict]:
+    """
+    All the results of a sweep, by name. The keys of the distance pairs are floats again.
+    """
+    res = {}
+    for key in sorted(done(folder)):
+        with open(os.path.join(folder, key + ".json")) as f:
+            result = json.load(f)
+        result["pairs"] = {float(k): [tuple(p) for p in v] for k, v in result["pairs"].items()}
+        res[key] = result
+    return res
+
+
+if __name__ == "__main__":
+    # the runs, which were done by hand so far, just start it again after an interruption.
+    # run from the top folder with python -m objects.runner, the results go into the untracked output/.
+    sweep(grid([2, 3, 4, 5], [20003], [0.0125]), "output/sweep",
+          callback=lambda key, error: print("finished", key) if error is None else print("failed", key, repr(error)))
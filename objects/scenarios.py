@@ -0,0 +1,141 @@
+from objects.vector import Vector
+from objects.line import Line
+from objects.point import Point
+from objects.batch import RayBatch
+from objects.receivers import ReceiverGrid
+from objects.sources import mirror_tree, visible
+import objects.distances as distances
+import numpy as np
+
+
+class Scenario:
+    """
+    A single configuration of the simulation: the room, where the sender and the reciever are,
+    the maximum order of reflection and the radius of the reciever.
+    """
+    def __init__(self, walls: list[Line], sender: Point, reciever: Point, order: int, radius: float = 0.0125):
+        assert order >= 0
+        self.walls = walls
+        self.sender = sender
+        self.reciever = reciever
+        self.order = order
+        self.radius = radius
+
+    # ------------------------------------------------------------------------
+
+    def room(self) -> tuple:
+        """
+        Key of the room, so scenarios in the same room can share everything, which only depends on the walls.
+        """
+        return tuple(tuple(w.anchor.value) + tuple(w.direction.value) for w in self.walls)
+
+# ----------------------------------------------------------------------------
+
+
+class Result:
+    """
+    Compact result of one Scenario, only arrays and labels, no Ray or Vector objects.
+    points[i] is the image point with the label labels[i] (absolute coordinates) and edm the condensed
+    distance matrix between them. The distance groups are kept as arrays (see distances.pair_groups),
+    groups turns them into the dictionary, which engine.py prints.
+    """
+    __slots__ = ("points", "labels", "edm", "keys", "pairs", "bounds")
+
+    def __init__(self, points: np.ndarray, labels: list[str], edm: distances.EDM, keys: np.ndarray, pairs: np.ndarray, bounds: np.ndarray):
+        self.points = points
+        self.labels = labels
+        self.edm = edm
+        self.keys = keys
+        self.pairs = pairs
+        self.bounds = bounds
+
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def create(cls, images: list[tuple[Vector, str]], decimals: int) -> "Result":
+        """
+        Builds the result from (position, label) pairs like in Engine.images.
+        """
+        points = np.array([p.end.value for p, _ in images], dtype=np.float64).reshape(-1, 2)
+        labels = [l for _, l in images]
+
+        # the same matrix as Engine.create_edm, which takes the points seen from the reciever.
+        matrix = distances.EDM.create(images)
+        return cls(points, labels, matrix, *distances.pair_groups(matrix, decimals))
+
+    # ------------------------------------------------------------------------
+
+    def groups(self) -> dict[float, list[tuple[str, str]]]:
+        """
+        rounded distance: list of label pairs, only the distances with more than one pair.
+        """
+        return distances.labelled(self.labels, self.keys, self.pairs, self.bounds)
+
+# ----------------------------------------------------------------------------
+
+def run(scenarios: list[Scenario], decimals: int = 1, method: str = "exact", rounds: int = 20003, cache=None) -> list[Result]:
+    """
+    Runs many scenarios without an Engine for each of them and without any plots.
+    Everything, that only depends on the room and the sender, is computed once per room and sender:
+    with the method "exact" that is the mirror tree of objects/sources.py (for the largest order needed),
+    with the method "sweep" it is a single sweep for all recievers with the same order and radius,
+    which are then found with a ReceiverGrid.
+
+    :param scenarios: The configurations.
+    :type scenarios: list[Scenario]
+    :param decimals: Decimals for the distance groups, like in Engine.compare_point_pair_distances.
+    :type decimals: int
+    :param method: "exact" for image sources, "sweep" for rays.
+    :type method: str
+    :param rounds: Amount of rays for the sweep, like ROUNDS.
+    :type rounds: int
+    :param cache: Optional ResultCache (objects/cache.py), only the scenarios missing in there are computed.
+    :type cache: ResultCache
+    :return: One result for each scenario, in the same order.
+    :rtype: list[Result]
+    """
+    assert method in ("exact", "sweep")
+    results = [None] * len(scenarios)
+
+    # everything already in the cache doesn't need to be computed again.
+    keys = []
+    if cache is not None:
+        from objects.cache import key
+        parameters = {"method": method, "decimals": decimals}
+        if method == "sweep":
+            parameters["rounds"] = rounds
+        keys = [key(s, **parameters) for s in scenarios]
+        results = [cache.get(k) for k in keys]
+
+    # scenarios sharing the same precomputation.
+    shared = {}
+    for i, s in enumerate(scenarios):
+        if results[i] is not None:
+            continue
+        key = (s.room(), tuple(s.sender.value))
+        if method == "sweep":
+            key += (s.order, s.radius)
+        shared.setdefault(key, []).append(i)
+
+    for members in shared.values():
+        first = scenarios[members[0]]
+
+        if method == "exact":
+            tree = mirror_tree(first.walls, first.sender, max(scenarios[i].order for i in members))
+            for i in members:
+                s = scenarios[i]
+                candidates = [c for c in tree if len(c[0]) <= s.order]
+                results[i] = Result.create(visible(s.walls, s.sender, s.reciever, candidates), decimals)
+
+        else:
+            grid = ReceiverGrid([scenarios[i].reciever for i in members], first.radius)
+            batch = RayBatch.sweep(first.sender, rounds, first.order)
+            batch.expand(first.walls, grid)
+            for i, images in zip(members, batch.heard_images(grid)):
+                results[i] = Result.create(images, decimals)
+
+        if cache is not None:
+            for i in members:
+                cache.put(keys[i], results[i])
+
+    return results
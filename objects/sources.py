@@ -0,0 +1,150 @@
+from objects.vector import Vector
+from objects.line import Line
+from objects.point import Point
+from objects.labels import make_label
+import numpy as np
+
+
+def inside(wall: Line, p: Point, q: Point) -> bool:
+    """
+    Checks whether p lies on the same side of the (infinite) wall as q.
+    Points directly on the wall are not inside.
+    """
+    r = wall.direction.value
+    a = wall.anchor.value
+    side_p = r[0] * (p.value[1] - a[1]) - r[1] * (p.value[0] - a[0])
+    side_q = r[0] * (q.value[1] - a[1]) - r[1] * (q.value[0] - a[0])
+    return side_p * side_q > 0
+
+# ----------------------------------------------------------------------------
+
+def mirror_tree(walls: list[Line], sender: Point, max_order: int) -> list[tuple[list[int], list[Point]]]:
+    """
+    Mirrors the sender order by order with Line.mirror. Only depends on the sender and the walls,
+    so the result can be shared by any amount of recievers. Nothing is registered in the Line.images
+    of the walls, most candidates are never seen.
+    The same wall twice in a row is never mirrored, because it cancels (see analytics.shredded),
+    and an image behind a wall can't be reflected by it anymore, so that branch ends there.
+
+    :param walls: The walls of the room.
+    :type walls: list[Line]
+    :param sender: Position of the sender.
+    :type sender: Point
+    :param max_order: The maximum order of reflection.
+    :type max_order: int
+    :return: Every candidate as (sequence of walls, image points along the way), ordered by order.
+    :rtype: list[tuple[list[int], list[Point]]]
+    """
+    assert max_order >= 0
+    res = [([], [])]
+    level = res
+    for o in range(0, max_order):
+        following = []
+        for sequence, images in level:
+            source = images[-1] if images else sender
+
+            # mirror on all the walls, which are still in front of the image point.
+            for j, w in enumerate(walls):
+                if sequence and sequence[-1] == j:
+                    continue
+                if not inside(w, source, sender):
+                    continue
+                image = Point(list(w.mirror(source.value[0], source.value[1])))
+                following.append((sequence + [j], images + [image]))
+        res += following
+        level = following
+
+    return res
+
+# ----------------------------------------------------------------------------
+
+def visible(walls: list[Line], sender: Point, reciever: Point, tree: list[tuple[list[int], list[Point]]]) -> list[tuple[Vector, str]]:
+    """
+    Keeps the candidates of mirror_tree, which the reciever can actually see.
+    Walks back from the reciever towards each image point and checks, that the closest wall on the way
+    is the one of the sequence and that the last part to the sender is free. All candidates of the same
+    order at once with numpy.
+
+    :return: (position, label) pairs like in Engine.images, with the position seen from the reciever.
+    :rtype: list[tuple[Vector, str]]
+    """
+    wa = np.array([w.anchor.value for w in walls], dtype=np.float64)
+    wr = np.array([w.direction.value for w in walls], dtype=np.float64)
+    s = np.array(sender.value, dtype=np.float64)
+
+    seen = np.zeros(len(tree), dtype=bool)
+    by_order = {}
+    for i, (sequence, _) in enumerate(tree):
+        by_order.setdefault(len(sequence), []).append(i)
+
+    for k, members in by_order.items():
+        members = np.array(members)
+        sequences = np.array([tree[i][0] for i in members], dtype=np.int64).reshape(len(members), k)
+        images = np.array([[p.value for p in tree[i][1]] for i in members], dtype=np.float64).reshape(len(members), k, 2)
+
+        # walk back from the reciever.
+        p = np.broadcast_to(np.array(reciever.value, dtype=np.float64), (len(members), 2))
+        block = np.full(len(members), -1)
+        ok = np.ones(len(members), dtype=bool)
+        for i in range(k - 1, -1, -1):
+            m, y = _nearest(wa, wr, p, images[:, i], block)
+
+            # the wall must be the one of the sequence and lie between p and the image point, like in Ray.
+            ok &= (m == sequences[:, i]) & (y <= 1.)
+            # paths without a hit are already lost, inf * 0 there doesn't matter.
+            with np.errstate(invalid="ignore"):
+                p = p + y[:, None] * (images[:, i] - p)
+            block = m
+
+        # the last part to the sender must be free as well.
+        _, y = _nearest(wa, wr, p, np.broadcast_to(s, p.shape), block)
+        ok &= ~(y < 1.)
+        seen[members[ok]] = True
+
+    res = []
+    for i in np.flatnonzero(seen):
+        sequence, images = tree[i]
+        source = images[-1] if images else sender
+        label = make_label([j + 1 for j in sequence], len(walls))
+        res.append((Vector(reciever, Point(list(source.value))), label))
+    return res
+
+# ----------------------------------------------------------------------------
+
+def _nearest(wa: np.ndarray, wr: np.ndarray, start: np.ndarray, target: np.ndarray, block: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The closest wall on the lines from start to target. Returns the index of the closest wall and
+    the step y along target - start, where it is hit (inf if no wall is hit).
+    """
+    d = target - start
+    r0, r1 = wr[:, 0][None, :], wr[:, 1][None, :]
+    p0, p1 = wa[:, 0][None, :], wa[:, 1][None, :]
+    q0, q1 = start[:, 0][:, None], start[:, 1][:, None]
+    s0, s1 = d[:, 0][:, None], d[:, 1][:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        det = (r1 * s0) - (r0 * s1)
+        y = (r1 * (p0 - q0) + r0 * (q1 - p1)) / det
+    y = np.where((det != 0) & (y > 0), y, np.inf)
+    y[np.arange(len(d)), np.maximum(block, 0)] = np.where(block >= 0, np.inf, y[np.arange(len(d)), np.maximum(block, 0)])
+    m = np.argmin(y, axis=1)
+    return m, y[np.arange(len(d)), m]
+
+# ----------------------------------------------------------------------------
+
+def image_sources(walls: list[Line], sender: Point, reciever: Point, max_order: int) -> list[tuple[Vector, str]]:
+    """
+    Deterministic alternative to the angular sweep. Builds all the image points of the sender
+    directly (mirror_tree) and keeps every one, which the reciever can actually see.
+
+    :param walls: The walls of the room.
+    :type walls: list[Line]
+    :param sender: Position of the sender.
+    :type sender: Point
+    :param reciever: Position of the reciever.
+    :type reciever: Point
+    :param max_order: The maximum order of reflection.
+    :type max_order: int
+    :return: (position, label) pairs like in Engine.images, with the position seen from the reciever.
+    :rtype: list[tuple[Vector, str]]
+    """
+    return visible(walls, sender, reciever, mirror_tree(walls, sender, max_order))
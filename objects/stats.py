@@ -0,0 +1,142 @@
+"""
+Optional instrumentation for the Engine and the rays: wall-clock time per stage, counters
+(intersections tested, reflections computed, reciever hits, rays discarded ...) and the
+peak memory per stage.
+Engine.parallel_sound_events is not instrumented, the worker processes have their own counters.
+Everything is off by default. Then stage() hands out the same empty context every time and the
+hot loops only check ENABLED once per ray, so it costs next to nothing.
+
+    import objects.stats as stats
+    stats.enable()
+    e.sound_events(5)
+    stats.dump("stats.json")
+"""
+from contextlib import nullcontext, contextmanager
+import tracemalloc
+import json
+import time
+
+
+ENABLED = False # read directly by the hot loops, so keep it a plain module attribute.
+MEMORY = False # also trace the peak memory of each stage, which slows everything down a lot.
+
+_stages = {} # name: {"seconds", "calls", "peak"}
+_counters = {} # name: amount
+_empty = nullcontext()
+
+# ----------------------------------------------------------------------------
+
+def enable(memory: bool = False):
+    """
+    Starts collecting, memory also measures the peak memory of every stage with tracemalloc.
+    """
+    global ENABLED, MEMORY
+    ENABLED = True
+    MEMORY = memory
+
+# ----------------------------------------------------------------------------
+
+def disable():
+    global ENABLED, MEMORY
+    ENABLED = False
+    MEMORY = False
+
+# ----------------------------------------------------------------------------
+
+@contextmanager
+def paused():
+    """
+    Nothing is counted inside, for work which was already counted somewhere else
+    (like the Ray objects RayBatch.rays builds from rays the batch already traced).
+    Stages, which were entered before, still get their time.
+    """
+    global ENABLED
+    enabled = ENABLED
+    ENABLED = False
+    try:
+        yield
+    finally:
+        ENABLED = enabled
+
+# ----------------------------------------------------------------------------
+
+def reset():
+    """
+    Forgets everything collected so far.
+    """
+    _stages.clear()
+    _counters.clear()
+
+# ----------------------------------------------------------------------------
+
+def count(name: str, amount: int = 1):
+    """
+    Adds to a counter. Hot loops should sum up locally and call this once.
+    """
+    if ENABLED:
+        _counters[name] = _counters.get(name, 0) + amount
+
+# ----------------------------------------------------------------------------
+
+
+class _Stage:
+    """
+    Measures one run of a stage. Stages can be nested, but then the peak memory of the outer
+    one only covers the part after the last inner stage started.
+    """
+    __slots__ = ("name", "start", "traced", "memory")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    # ------------------------------------------------------------------------
+
+    def __enter__(self):
+        self.traced = MEMORY
+        if self.traced:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    # ------------------------------------------------------------------------
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        entry = _stages.setdefault(self.name, {"seconds": 0., "calls": 0, "peak": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += 1
+        if self.traced:
+            # only what the stage needed on top of what was there before.
+            entry["peak"] = max(entry["peak"], tracemalloc.get_traced_memory()[1] - self.memory)
+        return False
+
+# ----------------------------------------------------------------------------
+
+def stage(name: str):
+    """
+    Context manager timing the code inside as the given stage, an empty one if disabled.
+    """
+    if not ENABLED:
+        return _empty
+    return _Stage(name)
+
+# ----------------------------------------------------------------------------
+
+def report() -> dict:
+    """
+    Everything collected: {"stages": {name: {seconds, calls, peak bytes}}, "counters": {name: amount}}.
+    The peak is the most memory a stage needed on top of what was allocated before it, 0 if the memory wasn't traced.
+    """
+    return {"stages": {k: dict(v) for k, v in _stages.items()}, "counters": dict(_counters)}
+
+# ----------------------------------------------------------------------------
+
+def dump(path: str):
+    """
+    Writes the report as JSON.
+    """
+    with open(path, "w") as f:
+        json.dump(report(), f, indent=1)
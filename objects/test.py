@@ -2,7 +2,26 @@ from point import Point
 from vector import Vector
 from line import Line
 from ray import Ray
+from labels import make_label, reflections
+from batch import RayBatch, trace, stream
+from sources import image_sources
+from adaptive import AdaptiveSweep
+from receivers import ReceiverGrid
+from distances import EDM, DistanceIndex, groups
+from scenarios import Scenario, run
+from cache import ResultCache, key
+from walls import WallIndex
+from room import Room
+from beams import beam_tree, heard
+from trajectory import Trajectory
+import rir
+import stats
+import analytics
 import math
+import tempfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import matplotlib.pyplot as plt
 
 # ----------------------------------------------------------------------------
@@ -104,6 +123,388 @@ def test_ray(show: bool = False):
         
 # ----------------------------------------------------------------------------
 
+def triangle() -> list[Line]:
+    """
+    New walls of the triangle of Engine.generate, so every test has its own Line.images.
+    """
+    base = Line(Point([-7.122, -16.432]), Vector(Point([0.,0.]), Point([20.891, -2.432])))
+    right = Line(Point([10.,15.]), Vector(Point([0.,0.]), Point([25.879, -41.891])))
+    left = Line(Point([-23.758, 0.453]), Vector(Point([0.,0.]), Point([4.499, 9.175])))
+    return [base, right, left]
+
+# ----------------------------------------------------------------------------
+
+def test_batch(show: bool = False):
+    walls = triangle()
+    s = Point([-3.123, 19.543])
+    rec = (Point([0.,0.]), 0.0125)
+    batch = RayBatch.sweep(s, 2000, 3)
+    batch.expand(walls, rec)
+
+    # the same fan with single rays like Engine.sound_events, on their own walls.
+    single = triangle()
+    fan = []
+    for x in range(2000):
+        ray = Ray(Vector(s, Point([s.value[0] + math.cos(2 * math.pi * (x / 2000)), s.value[1] + math.sin(2 * math.pi * (x / 2000))])), 3)
+        ray.expand(single, rec)
+        fan.append(ray)
+    hits = [ray for ray in fan if ray.recieved]
+    assert [x for x, ray in enumerate(fan) if ray.recieved] == [int(x) for x in np.flatnonzero(batch.recieved)]
+    assert [ray.pov(rec, plotting=False)[1] for ray in hits] == batch.labels()
+    assert [ray.pov(rec, plotting=False)[0].end.value for ray in hits] == batch.pov(rec).tolist()
+    for w, v in zip(walls, single):
+        assert {o: [p.value for p in points] for o, points in w.images.items()} == {o: [p.value for p in points] for o, points in v.images.items()}
+
+    # the recieved rays have to be the same as with the single rays.
+    rays = batch.rays(walls, rec)
+    assert len(rays) == batch.recieved.sum()
+    for ray, end, label in zip(rays, batch.pov(rec), batch.labels()):
+        pov, l = ray.pov(rec)
+        assert pov.end.value == list(end)
+        assert l == label
+
+    if show:
+        for ray in rays:
+            ray.plot()
+
+# ----------------------------------------------------------------------------
+
+def test_edm(show: bool = False):
+    points = [[0., 0.], [3., 4.], [-1., 2.], [6., 8.]]
+    labels = ["I", "I1", "I2", "I12"]
+    edm = EDM(labels, points, block=3)
+
+    # the condensed form has to match the full loop, in both directions.
+    for i, p in enumerate(points):
+        for j, q in enumerate(points):
+            assert edm[i, j] == abs(Vector(Point(p), Point(q)))
+    assert edm["I1", "I12"] == 5.
+    assert edm.table()[0] == [" "] + labels
+    assert edm.table()[2][0] == "I1"
+
+    # a group goes from its first distance up to the tolerance above it, 1.1 still belongs to 1.0,
+    # 1.10001 starts its own group and is dropped alone.
+    keys, pairs, bounds = DistanceIndex(EDM(["a", "b", "c"], [[0., 0.]] * 3, values=[1., 1.1, 1.10001])).groups(0.1)
+    assert list(keys) == [1.] and list(bounds) == [0, 2]
+
+    # a chain of close distances isn't one group, every group is at most the tolerance wide.
+    values = [1., 1.06, 1.12, 1.18, 1.24]
+    index = DistanceIndex(EDM(["a", "b", "c", "d"], [[0., 0.]] * 4, values=values + [5.]))
+    keys, pairs, bounds = index.groups(0.1)
+    assert list(keys) == [1., 1.2] and list(bounds) == [0, 2, 4]
+    for g in range(len(keys)):
+        d = [index.matrix[i, j] for i, j in pairs[bounds[g]:bounds[g + 1]].tolist()]
+        assert max(d) - min(d) <= 0.1
+
+# ----------------------------------------------------------------------------
+
+def test_walls(show: bool = False):
+    room = WallIndex.polygon([Point([0., 0.]), Point([10., 0.]), Point([10., 10.]), Point([0., 10.])])
+
+    # straight to the right from the middle, the first wall is the one at x = 10.
+    m, t = room.cast([[5., 5.], [5., 5.]], [[1., 0.], [0., -2.]])
+    assert list(m) == [1, 0]
+    assert list(t) == [5., 2.5]
+
+    # the blocked wall is skipped, so a ray on a wall doesn't hit it again.
+    m, _ = room.cast([[10., 5.]], [[-1., 0.]], [1])
+    assert m[0] == 3
+
+    # a single ray with first walks the same cells as cast, also from outside of the room.
+    for x, y in [(5., 5.), (1., 9.), (-3., 4.)]:
+        for k in range(16):
+            dx, dy = math.cos(0.4 * k + 0.1), math.sin(0.4 * k + 0.1)
+            m, t = room.cast([[x, y]], [[dx, dy]])
+            assert room.first(x, y, dx, dy)[:2] == (int(m[0]), float(t[0]))
+
+    if show:
+        room.plot()
+
+# ----------------------------------------------------------------------------
+
+def test_room(show: bool = False):
+    # clockwise on purpose, the normals still have to point inside.
+    room = Room([Point([0., 0.]), Point([0., 10.]), Point([10., 10.]), Point([10., 0.])])
+    assert room.convex
+    assert list(room.normals[0]) == [1., 0.]
+
+    # the same walls as the grid finds.
+    m, t = room.cast([[5., 5.], [10., 5.]], [[1., 0.], [-1., 0.]], [-1, 2])
+    assert list(m) == [2, 0]
+    assert list(t) == [5., 10.]
+
+    # first takes the half-planes as well, the blocked wall is skipped.
+    assert room.first(5., 5., 1., 0.) == (2, 5., 4)
+    assert room.first(10., 5., -1., 0., 2) == (0, 10., 3)
+
+    # a notch makes it concave, first goes through the grid then.
+    notch = Room([Point([0., 0.]), Point([10., 0.]), Point([5., 5.]), Point([10., 10.]), Point([0., 10.])])
+    assert not notch.convex
+    m, t = notch.cast([[2., 3.]], [[1., 0.]])
+    assert notch.first(2., 3., 1., 0.)[:2] == (int(m[0]), float(t[0])) == (1, 5.)
+
+    if show:
+        room.plot()
+
+# ----------------------------------------------------------------------------
+
+def test_beams(show: bool = False):
+    room = Room([Point([0., 0.]), Point([10., 0.]), Point([10., 10.]), Point([0., 10.])])
+    sender, reciever = Point([2., 3.]), Point([7., 6.])
+
+    # in a square every wall reflects once, the image of wall 4 (x = 0) lies at (-2, 3).
+    images = dict((label, pov.end.value) for pov, label in heard(room, reciever, beam_tree(room, sender, 1)))
+    assert sorted(images) == ["I", "I1", "I2", "I3", "I4"]
+    assert images["I4"] == [-2., 3.]
+
+    if show:
+        room.plot()
+
+# ----------------------------------------------------------------------------
+
+def test_trajectory(show: bool = False):
+    room = Room([Point([0., 0.]), Point([10., 0.]), Point([10., 10.]), Point([0., 10.])])
+    t = Trajectory(room, Point([2., 3.]), 2)
+
+    # moving a bit only changes the reciever, the matrix is the same as a new one.
+    for p in [Point([7., 6.]), Point([7.5, 6.])]:
+        images, edm = t.move(p)
+        new = EDM.create(images)
+        assert edm.labels == new.labels
+        assert max(abs(a - b) for a, b in zip(edm.values, new.values)) < 1e-9
+
+    if show:
+        room.plot()
+
+# ----------------------------------------------------------------------------
+
+def test_labels(show: bool = False):
+    # the room decides the format, so wall 12 and the walls 1, 2 never share a label.
+    assert make_label([1, 2]) == "I12"
+    assert make_label([12], 12) != make_label([1, 2], 12)
+    assert reflections(make_label([1, 12, 3], 12)) == (1, 12, 3)
+    assert analytics.canonical(("I-1-12", "I-12")) == (1,)
+
+# ----------------------------------------------------------------------------
+
+def test_rir(show: bool = False):
+    # 343 m away at 100 Hz is sample 100, the second one is reflected twice on the way.
+    h = rir.responses([0, 0, 1], [343., 686., 343.], [0, 2, 1], 2, rate=100, attenuation=0.5)
+    assert h.shape == (2, 201)
+    assert h[0, 100] == 1 / 343.
+    assert h[0, 200] == 0.25 / 686.
+    assert h[1, 100] == 0.5 / 343.
+    assert list(rir.orders(["I", "I231", "I-1-12", "I-12"])) == [0, 3, 2, 1]
+
+    if show:
+        plt.plot(h[0])
+
+# ----------------------------------------------------------------------------
+
+def test_sources(show: bool = False):
+    walls = triangle()
+    s = Point([-3.123, 19.543])
+    rec = (Point([0.,0.]), 0.0125)
+    exact = dict((label, abs(pov)) for pov, label in image_sources(walls, s, rec[0], 3))
+
+    # nothing of the candidates is left on the walls.
+    assert all(not w.images for w in walls)
+
+    # every image point of the sweep is an exact one, only the radius makes the sweep a bit longer.
+    batch = RayBatch.sweep(s, 20003, 3)
+    batch.expand(triangle(), rec)
+    sweep = dict((label, abs(pov)) for pov, label in batch.images(rec))
+    assert len(sweep) > 10 and set(sweep) <= set(exact)
+    assert all(abs(sweep[l] - exact[l]) < 4 * rec[1] for l in sweep)
+
+    if show:
+        for pov, label in image_sources(walls, s, rec[0], 3):
+            pov.end.plot("orange", label)
+
+# ----------------------------------------------------------------------------
+
+def test_adaptive(show: bool = False):
+    walls = triangle()
+    s = Point([-3.123, 19.543])
+    rec = (Point([0.,0.]), 0.0125)
+    full = RayBatch.sweep(s, 20003, 5)
+    full.expand(walls, rec)
+    sweep = AdaptiveSweep(triangle(), s, rec, 5, 20003)
+    images = sweep.run()
+
+    # the same recieved angles and image points as the full fan, with a lot less rays.
+    assert list(sweep.recieved()) == list(np.flatnonzero(full.recieved))
+    assert sorted((label, pov.end.value) for pov, label in images) == sorted((label, pov.end.value) for pov, label in full.images(rec))
+    assert sweep.traced < 20003 // 4
+
+    if show:
+        for pov, label in images:
+            pov.end.plot("orange", label)
+
+# ----------------------------------------------------------------------------
+
+def test_parallel(show: bool = False):
+    walls = triangle()
+    s = Point([-3.123, 19.543])
+    rec = (Point([0.,0.]), 0.0125)
+    full = RayBatch.sweep(s, 20003, 4)
+    full.expand(walls, rec)
+
+    # the parts in two processes, merged in their order like Engine.parallel_sound_events.
+    parts = np.array_split(np.arange(20003), 8)
+    with ProcessPoolExecutor(2) as pool:
+        results = list(pool.map(trace, repeat(triangle()), repeat(s), repeat(rec), repeat(4), repeat(20003), parts))
+    merged = triangle()
+    for _, _, _, images in results:
+        for w, collected in zip(merged, images):
+            for o, points in collected.items():
+                for value in points:
+                    w.register(Point(value), o)
+
+    # the same as the serial sweep, also the order of the image points on the walls.
+    assert np.concatenate([r[0] for r in results]).tolist() == np.flatnonzero(full.recieved).tolist()
+    assert np.concatenate([r[1] for r in results]).tolist() == full.pov(rec).tolist()
+    assert [l for r in results for l in r[2]] == full.labels()
+    for w, v in zip(walls, merged):
+        assert {o: [p.value for p in points] for o, points in w.images.items()} == {o: [p.value for p in points] for o, points in v.images.items()}
+
+# ----------------------------------------------------------------------------
+
+def test_receivers(show: bool = False):
+    s = Point([-3.123, 19.543])
+    points = [Point([0., 0.]), Point([-2., 3.]), Point([1.5, -4.]), Point([-6., 1.])]
+    grid = ReceiverGrid(points, 0.0125)
+
+    # the grid finds the same segments as testing every reciever.
+    rng = np.random.default_rng(1)
+    starts, ends = rng.uniform(-10., 10., (2000, 2)), rng.uniform(-10., 10., (2000, 2))
+    seg, rec, _ = grid.hits(starts, ends)
+    brute = set()
+    for i, (a, b) in enumerate(zip(starts, ends)):
+        for j, p in enumerate(points):
+            d, w = b - a, np.array(p.value) - a
+            t = min(max((w @ d) / (d @ d), 0.), 1.)
+            if np.hypot(*(a + t * d - p.value)) <= 0.0125:
+                brute.add((i, j))
+    assert set(zip(seg.tolist(), rec.tolist())) == brute
+
+    # one sweep for all of them hears the same as one sweep for each.
+    batch = RayBatch.sweep(s, 20003, 4)
+    batch.expand(triangle(), grid)
+    for p, images in zip(points, batch.heard_images(grid)):
+        single = RayBatch.sweep(s, 20003, 4)
+        single.expand(triangle(), (p, 0.0125))
+        assert sorted(l for _, l in images) == sorted(l for _, l in single.images((p, 0.0125)))
+
+    if show:
+        for p in points:
+            p.plot("cyan")
+
+# ----------------------------------------------------------------------------
+
+def test_scenarios(show: bool = False):
+    walls = triangle()
+    s = Point([-3.123, 19.543])
+    points = [Point([0., 0.]), Point([-2., 3.]), Point([1.5, -4.])]
+    scenarios = [Scenario(walls, s, p, o) for p in points for o in (2, 4)]
+
+    # the shared mirror tree gives the same as every scenario on its own, with the same groups as the Engine.
+    for scenario, result in zip(scenarios, run(scenarios)):
+        images = image_sources(walls, s, scenario.reciever, scenario.order)
+        assert result.labels == [l for _, l in images]
+        assert result.points.tolist() == [pov.end.value for pov, _ in images]
+        assert result.groups() == groups(EDM.create(images), 1)
+
+    # one sweep for the recievers of the same order.
+    for scenario, result in zip(scenarios, run(scenarios, method="sweep", rounds=4000)):
+        batch = RayBatch.sweep(s, 4000, scenario.order)
+        batch.expand(triangle(), (scenario.reciever, scenario.radius))
+        assert sorted(result.labels) == sorted(l for _, l in batch.images((scenario.reciever, scenario.radius)))
+
+# ----------------------------------------------------------------------------
+
+def test_stream(show: bool = False):
+    s = Point([-3.123, 19.543])
+    rec = (Point([0.,0.]), 0.0125)
+    batch = RayBatch.sweep(s, 20003, 5)
+    batch.expand(triangle(), rec)
+
+    # chunk by chunk the same rays as all at once, the direction points at the pov end.
+    hits = list(stream(triangle(), s, rec, 5, 20003, 1000))
+    assert [h[0] for h in hits] == np.flatnonzero(batch.recieved).tolist()
+    assert [h[1] for h in hits] == batch.labels()
+    assert [h[2] for h in hits] == batch.length[batch.recieved].tolist()
+    pov = batch.pov(rec)
+    assert np.allclose(pov / np.sqrt((pov ** 2).sum(axis=1))[:, None], [h[3] for h in hits])
+
+# ----------------------------------------------------------------------------
+
+def test_cache(show: bool = False):
+    s = Point([-3.123, 19.543])
+    scenario = Scenario(triangle(), s, Point([0., 0.]), 3)
+
+    # the key only depends on the content, the smallest change is another key.
+    assert key(scenario, method="exact") == key(Scenario(triangle(), Point([-3.123, 19.543]), Point([0., 0.]), 3), method="exact")
+    assert key(scenario, method="exact") != key(Scenario(triangle(), s, Point([0., 0.]), 3, 0.0126), method="exact")
+    assert key(scenario, method="exact") != key(scenario, method="sweep")
+
+    with tempfile.TemporaryDirectory() as folder:
+        cache = ResultCache(folder)
+        result = run([scenario], cache=cache)[0]
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        # a new cache on the same folder finds it, with everything the same.
+        cache = ResultCache(folder)
+        stored = run([scenario], cache=cache)[0]
+        assert (cache.hits, cache.misses) == (1, 0)
+        assert stored.labels == result.labels and stored.points.tolist() == result.points.tolist()
+        assert stored.edm.values.tolist() == result.edm.values.tolist() and stored.groups() == result.groups()
+
+        # a small limit keeps only the newest results, the running total stays the size of the folder.
+        cache = ResultCache(folder, limit=int(3.5 * cache.size()))
+        others = [Scenario(triangle(), s, Point([0.1 * i, 0.]), 3) for i in range(1, 6)]
+        for other in others:
+            run([other], cache=cache)
+            assert cache.total == cache.size() <= cache.limit
+        assert cache.get(key(scenario, method="exact", decimals=1)) is None
+        assert cache.get(key(others[-1], method="exact", decimals=1)) is not None
+
+# ----------------------------------------------------------------------------
+
+def test_stats(show: bool = False):
+    s = Point([-3.123, 19.543])
+    rec = (Point([0.,0.]), 0.0125)
+    fan = [Vector(s, Point([s.value[0] + math.cos(2 * math.pi * x / 500), s.value[1] + math.sin(2 * math.pi * x / 500)])) for x in range(500)]
+
+    stats.reset()
+    stats.enable()
+    try:
+        # the infinite lines and the room between them count the same.
+        counters = []
+        for walls in (triangle(), Room.from_lines(triangle())):
+            stats.reset()
+            for v in fan:
+                Ray(v, 5).expand(walls, rec)
+            counters.append(stats.report()["counters"])
+        assert counters[0] == counters[1]
+        assert counters[0]["reciever tests"] == counters[0]["reflections computed"] + counters[0].get("reciever hits", 0)
+
+        # the batch counted its rays already, the Ray objects of them add nothing, only the stage is timed.
+        stats.reset()
+        batch = RayBatch.sweep(s, 20003, 3)
+        batch.expand(triangle(), rec)
+        with stats.stage("recieved rays"):
+            rays = batch.rays(triangle(), rec)
+        assert len(rays) > 0
+        assert stats.report()["counters"] == {}
+        assert stats.report()["stages"]["recieved rays"]["calls"] == 1
+        assert stats.ENABLED
+    finally:
+        stats.disable()
+        stats.reset()
+
+# ----------------------------------------------------------------------------
+
 if __name__ == "__main__":
     test_point()
     test_vector()
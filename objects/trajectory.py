@@ -0,0 +1,89 @@
+from objects.vector import Vector
+from objects.line import Line
+from objects.point import Point
+from objects.labels import make_label
+from objects.walls import WallIndex
+from objects.beams import beam_tree, arrays, contains, room
+from objects.distances import EDM
+import objects.stats as stats
+import numpy as np
+
+
+class Trajectory:
+    """
+    A reciever moving through a room with a fixed sender. The beams (see objects/beams.py) and with them
+    all image points only depend on the sender and the walls, so they are traced once. For every new
+    position only the visibility of the beams is checked again, and the distance matrix keeps all rows
+    of image points, which were already visible before, only the new ones are computed.
+
+        t = Trajectory(e.walls, e.sender, 10)
+        for p in positions:
+            images, edm = t.move(p)
+    """
+    def __init__(self, walls: list[Line] | WallIndex, sender: Point, max_order: int):
+        self.walls = room(walls)
+        self.sender = sender
+        self.tree = beam_tree(self.walls, sender, max_order)
+        self.beams = arrays(self.tree)
+
+        # pieces of the same beam share the label, so the image points get their own index.
+        self.labels = []
+        ids = {}
+        for beam in self.tree:
+            label = make_label([j + 1 for j in beam.sequence], len(self.walls))
+            if label not in ids:
+                ids[label] = len(self.labels)
+                self.labels.append(label)
+        self.ids = np.array([ids[make_label([j + 1 for j in beam.sequence], len(self.walls))] for beam in self.tree], dtype=np.int64)
+        self.points = np.zeros((len(self.labels), 2))
+        self.points[self.ids] = self.beams[0]
+
+        # the visible image points of the last position and their full distance matrix.
+        self.members = np.zeros(0, dtype=np.int64)
+        self.square = np.zeros((0, 0))
+
+    # ------------------------------------------------------------------------
+
+    def visible(self, reciever: Point) -> np.ndarray:
+        """
+        Indices (into labels and points) of the image points the reciever sees, sorted.
+        """
+        return np.unique(self.ids[contains(self.walls, reciever, self.beams)])
+
+    # ------------------------------------------------------------------------
+
+    def move(self, reciever: Point) -> tuple[list[tuple[Vector, str]], EDM]:
+        """
+        The image points and their distance matrix for the next position of the reciever.
+
+        :param reciever: The new position.
+        :type reciever: Point
+        :return: (position, label) pairs like in Engine.images and their EDM, ordered by order.
+        :rtype: tuple[list[tuple[Vector, str]], EDM]
+        """
+        members = self.visible(reciever)
+        n = len(members)
+
+        # the rows of the image points, which stay visible, are copied, only the new ones are computed.
+        kept = np.isin(members, self.members)
+        pos = np.searchsorted(self.members, members)
+        square = np.empty((n, n))
+        square[np.ix_(kept, kept)] = self.square[np.ix_(pos[kept], pos[kept])]
+        fresh = np.flatnonzero(~kept)
+        points = self.points[members]
+        dx = points[:, 0][None, :] - points[fresh, 0][:, None]
+        dy = points[:, 1][None, :] - points[fresh, 1][:, None]
+        d = np.sqrt(np.float_power(dx, 2) + np.float_power(dy, 2))
+        square[fresh, :] = d
+        square[:, fresh] = d.T
+        stats.count("edm rows computed", len(fresh))
+        stats.count("edm rows kept", n - len(fresh))
+
+        self.members = members
+        self.square = square
+        labels = [self.labels[i] for i in members.tolist()]
+        images = [(Vector(reciever, Point(p)), l) for p, l in zip(points.tolist(), labels)]
+        i, j = np.triu_indices(n, k=1)
+
+        # EDM.create takes the points seen from the reciever, the distances are the same up to rounding.
+        return images, EDM(labels, points - np.array(reciever.value[:2]), values=square[i, j])
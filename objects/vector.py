@@ -8,17 +8,21 @@ class Vector:
     Has some basic methods and the ability to be plottet, as an arrow with the
     given direction of the distance.
     Not all methods are multi dimensional, some are only for 2D.
+    Vectors are never changed after creation, so the length and the normalized version are cached.
     """
+    __slots__ = ("anchor", "end", "value", "length", "unit")
+
     def __init__(self, v: Point, u: Point):
         self.anchor = v # keep this as a referencing point on the line, is needed for later.
         self.end = u
-        tmp = u - v # creation of the distance via difference vector
-        self.value = tmp.value # the actual distance.
-    
-    # ------------------------------------------------------------------------
-    
-
 
+        # the actual distance, as difference vector, but without a temporary Point in 2D.
+        if len(u.value) == 2:
+            self.value = [u.value[0] - v.value[0], u.value[1] - v.value[1]]
+        else:
+            self.value = (u - v).value
+        self.length = None # cache for abs
+        self.unit = None # cache for normalized
 
     # ------------------------------------------------------------------------
 
@@ -26,14 +30,20 @@ class Vector:
         """
         Overrides the absolute value, which is the length of the vector.
         """
-        res = 0.
+        if self.length is not None:
+            return self.length
 
         # sum the square of all coordinates in the vector.
-        for v in self.value:
-            res += v ** 2
+        if len(self.value) == 2:
+            res = self.value[0] ** 2 + self.value[1] ** 2
+        else:
+            res = 0.
+            for v in self.value:
+                res += v ** 2
 
         # take the square root.
-        return math.sqrt(res)
+        self.length = math.sqrt(res)
+        return self.length
     
     # ------------------------------------------------------------------------
 
@@ -65,13 +75,11 @@ class Vector:
         :return: new Vector object with the same attributes as self, but new length.
         :rtype: Vector
         """
-        res = []
-        # multiply everything with the scalar.
-        for x in self.value:
-            res.append(x * scalar)
-        
-        # created the updated clone.
-        return Vector(self.anchor, self.anchor + Point(res))
+        # multiply everything with the scalar and created the updated clone.
+        a = self.anchor.value
+        if len(a) == 2:
+            return Vector(self.anchor, Point([a[0] + self.value[0] * scalar, a[1] + self.value[1] * scalar]))
+        return Vector(self.anchor, Point([p + x * scalar for p, x in zip(a, self.value)]))
 
     # ------------------------------------------------------------------------
 
@@ -82,15 +90,20 @@ class Vector:
         :return: self with length = 1.
         :rtype: Vector
         """
+        if self.unit is not None:
+            return self.unit
+
         # get current length
         scalar = abs(self)
 
         # protecting agains Zero division
         if self.value == [0., 0.]:
-            return self
+            self.unit = self
         
         # do the inverse scaling.
-        return self.scalar(1. / scalar)
+        else:
+            self.unit = self.scalar(1. / scalar)
+        return self.unit
 
     # ------------------------------------------------------------------------
 
@@ -104,12 +117,13 @@ class Vector:
         :return: Sum of products.
         :rtype: float
         """
+        if len(self.value) == 2:
+            return self.value[0] * other.value[0] + self.value[1] * other.value[1]
+
+        # sum the product of each pairwise multiplication.
         res = 0.
-        for i,_ in enumerate(self.value):
-            
-            # sum the product of each pairwise multiplication.
-            res += self.value[i] * other.value[i]
-        
+        for a, b in zip(self.value, other.value):
+            res += a * b
         return res
 
     # ------------------------------------------------------------------------
@@ -0,0 +1,259 @@
+from objects.vector import Vector
+from objects.line import Line
+from objects.point import Point
+import matplotlib.pyplot as plt
+import numpy as np
+import math
+
+
+class WallIndex:
+    """
+    Finite walls (segments from start to end) sorted into a uniform grid of square cells.
+    A ray walks through the cells along its way, one cell after another, and is only tested against
+    the walls in those cells. The first hit is the closest one, so it stops right there and walls
+    outside of the room are never even looked at (no guard with the previous intersection needed).
+    lines[j] is the infinite Line of wall j, for mirroring and for the image points, like the old walls.
+    """
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, cell: float = None):
+        self.starts = np.array(starts, dtype=np.float64).reshape(-1, 2)
+        self.ends = np.array(ends, dtype=np.float64).reshape(-1, 2)
+        assert len(self.starts) == len(self.ends) > 0
+        self.lines = [Line(Point(s.tolist()), Vector(Point([0., 0.]), Point((e - s).tolist()))) for s, e in zip(self.starts, self.ends)]
+
+        # about one wall per cell, a room with k walls has about sqrt(k) cells on each side.
+        lower = np.minimum(self.starts, self.ends).min(axis=0)
+        upper = np.maximum(self.starts, self.ends).max(axis=0)
+        if cell is None:
+            cell = max(upper[0] - lower[0], upper[1] - lower[1]) / max(1., math.sqrt(len(self.starts)))
+        self.cell = max(cell, 1e-9)
+
+        # one ring of empty cells around, so the walls on the border are inside as well.
+        self.origin = lower - self.cell
+        self.shape = np.floor((upper - self.origin) / self.cell).astype(np.int64) + 2
+
+        # walls sorted by cell, with the start of every cell, like a sparse matrix.
+        owner, cells = self._cover()
+        self.order = owner[np.argsort(cells, kind="stable")]
+        self.bounds = np.searchsorted(np.sort(cells), np.arange(self.shape[0] * self.shape[1] + 1))
+
+        # the same as plain Python lists for first, single rays don't pay for numpy.
+        self.segments = [(s[0], s[1], e[0] - s[0], e[1] - s[1]) for s, e in zip(self.starts.tolist(), self.ends.tolist())]
+        self.cells = [self.order[a:b].tolist() for a, b in zip(self.bounds[:-1], self.bounds[1:])]
+
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def polygon(cls, points: list[Point], cell: float = None) -> "WallIndex":
+        """
+        The walls of a closed polygon, wall j goes from points[j] to points[j + 1].
+        """
+        p = np.array([q.value for q in points], dtype=np.float64)
+        return cls(p, np.roll(p, -1, axis=0), cell)
+
+    # ------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    # ------------------------------------------------------------------------
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    # ------------------------------------------------------------------------
+
+    def __getitem__(self, j: int) -> Line:
+        return self.lines[j]
+
+    # ------------------------------------------------------------------------
+
+    def plot(self, color: str = "blue", name: str = ""):
+        """
+        Plots the walls as they are, not as infinite lines like Line.plot.
+        """
+        for s, e in zip(self.starts, self.ends):
+            plt.plot([s[0], e[0]], [s[1], e[1]], color=color, label=name)
+
+    # ------------------------------------------------------------------------
+
+    def _cover(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        All the (wall, cell) pairs: samples every wall in steps of a quarter cell and takes every cell
+        within an eighth cell of a sample. Between two samples, the wall can only cut a corner of a cell
+        by less than that, so a few cells too many can show up, but never one too few.
+        """
+        d = self.ends - self.starts
+        length = np.sqrt(d[:, 0] ** 2 + d[:, 1] ** 2)
+        counts = np.ceil(length / (0.25 * self.cell)).astype(np.int64) + 1
+        owner = np.repeat(np.arange(len(d)), counts)
+        k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = k / np.repeat(np.maximum(counts - 1, 1), counts)
+        samples = self.starts[owner] + t[:, None] * d[owner]
+
+        pad = 0.13 * self.cell
+        lo = np.clip(np.floor((samples - pad - self.origin) / self.cell).astype(np.int64), 0, self.shape - 1)
+        hi = np.clip(np.floor((samples + pad - self.origin) / self.cell).astype(np.int64), 0, self.shape - 1)
+        cells = []
+        for cx in (lo[:, 0], hi[:, 0]):
+            for cy in (lo[:, 1], hi[:, 1]):
+                cells.append(cx * self.shape[1] + cy)
+        cells = np.concatenate(cells)
+        owner = np.tile(owner, 4)
+
+        # every pair only once.
+        key = np.unique(owner * (self.shape[0] * self.shape[1]) + cells)
+        return key // (self.shape[0] * self.shape[1]), key % (self.shape[0] * self.shape[1])
+
+    # ------------------------------------------------------------------------
+
+    def first(self, x: float, y: float, dx: float, dy: float, block: int = -1) -> tuple[int, float]:
+        """
+        cast for a single ray (x, y) + t * (dx, dy) with plain floats, the same walk through the grid
+        one cell after another. For the rays of Ray.expand, where the arrays would cost more than the test.
+
+        :return: the index of the hit wall (-1 if it leaves without a hit), the t of the hit (inf if none)
+                 and the amount of walls tested, for the counters of Ray.expand.
+        :rtype: tuple[int, float, int]
+        """
+        ox, oy = float(self.origin[0]), float(self.origin[1])
+        nx, ny = int(self.shape[0]), int(self.shape[1])
+        cell = self.cell
+
+        # clip to the grid, t_in is where the ray enters it (or 0, if it starts inside).
+        t_in, t_out = 0., math.inf
+        for p, d, o, size in ((x, dx, ox, nx * cell), (y, dy, oy, ny * cell)):
+            if d == 0.:
+                if p < o or p > o + size:
+                    return -1, math.inf, 0
+                continue
+            t1, t2 = (o - p) / d, (o + size - p) / d
+            t_in, t_out = max(t_in, min(t1, t2)), min(t_out, max(t1, t2))
+        if t_in > t_out:
+            return -1, math.inf, 0
+
+        # the cell, where the ray starts and the t of the next cell border on each axis.
+        cx = min(max(math.floor((x + t_in * dx - ox) / cell), 0), nx - 1)
+        cy = min(max(math.floor((y + t_in * dy - oy) / cell), 0), ny - 1)
+        sx, sy = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+        tx = (ox + (cx + (sx > 0)) * cell - x) / dx if dx != 0. else math.inf
+        ty = (oy + (cy + (sy > 0)) * cell - y) / dy if dy != 0. else math.inf
+        ex = cell / abs(dx) if dx != 0. else math.inf
+        ey = cell / abs(dy) if dy != 0. else math.inf
+
+        tested = 0
+        while True:
+            # ray against segment, only hits before the ray leaves the cell count.
+            leave = min(tx, ty)
+            wall, best = -1, math.inf
+            for j in self.cells[cx * ny + cy]:
+                if j == block:
+                    continue
+                tested += 1
+                qx, qy, rx, ry = self.segments[j]
+                det = dx * ry - dy * rx
+                if det == 0.:
+                    continue
+                wx, wy = qx - x, qy - y
+                t = (wx * ry - wy * rx) / det
+                u = (wx * dy - wy * dx) / det
+                if 1e-9 < t <= leave and 0. <= u <= 1. and t < best:
+                    wall, best = j, t
+            if wall >= 0:
+                return wall, best, tested
+
+            # on to the next cell.
+            if tx <= ty:
+                cx, t = cx + sx, tx
+                tx += ex
+            else:
+                cy, t = cy + sy, ty
+                ty += ey
+            if not (0 <= cx < nx and 0 <= cy < ny) or t > t_out:
+                return -1, math.inf, tested
+
+    # ------------------------------------------------------------------------
+
+    def cast(self, starts: np.ndarray, directions: np.ndarray, block: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The first wall each ray start + t * direction (t > 0) hits.
+        All rays walk through the grid at the same time, one cell per iteration (like a DDA),
+        and only test the walls registered in their current cell.
+
+        :param starts: Where the rays start, shape (n, 2).
+        :type starts: np.ndarray
+        :param directions: Directions of the rays, shape (n, 2), not necessarily normalized.
+        :type directions: np.ndarray
+        :param block: Wall of each ray, which is skipped (the one it starts on), -1 for none.
+        :type block: np.ndarray
+        :return: the index of the hit wall (-1 if it leaves without a hit) and the t of the hit (inf if none).
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 2)
+        n = len(starts)
+        block = np.full(n, -1, dtype=np.int64) if block is None else np.asarray(block, dtype=np.int64)
+        wall = np.full(n, -1, dtype=np.int64)
+        best = np.full(n, np.inf)
+
+        # clip to the grid, t_in is where a ray enters it (or 0, if it starts inside).
+        size = self.shape * self.cell
+        t_in = np.zeros(n)
+        t_out = np.full(n, np.inf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for k in range(2):
+                t1 = (self.origin[k] - starts[:, k]) / directions[:, k]
+                t2 = (self.origin[k] + size[k] - starts[:, k]) / directions[:, k]
+                flat = directions[:, k] == 0.
+                inside = (starts[:, k] >= self.origin[k]) & (starts[:, k] <= self.origin[k] + size[k])
+                t_in = np.where(flat, t_in, np.maximum(t_in, np.minimum(t1, t2)))
+                t_out = np.where(flat, np.where(inside, t_out, -np.inf), np.minimum(t_out, np.maximum(t1, t2)))
+        alive = t_in <= t_out
+
+        # the cell, where each ray starts and the t of the next cell border on each axis.
+        p = starts + t_in[:, None] * directions
+        c = np.clip(np.floor((p - self.origin) / self.cell).astype(np.int64), 0, self.shape - 1)
+        step = np.where(directions > 0, 1, -1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            border = self.origin + (c + (step > 0)) * self.cell
+            t_next = np.where(directions != 0., (border - starts) / directions, np.inf)
+            t_delta = np.where(directions != 0., self.cell / np.abs(directions), np.inf)
+
+        idx = np.flatnonzero(alive)
+        while len(idx):
+            # all (ray, wall) pairs of the current cells.
+            cells = c[idx, 0] * self.shape[1] + c[idx, 1]
+            amount = self.bounds[cells + 1] - self.bounds[cells]
+            rays = np.repeat(idx, amount)
+            pos = np.repeat(self.bounds[cells], amount) + (np.arange(amount.sum()) - np.repeat(np.cumsum(amount) - amount, amount))
+            walls = self.order[pos]
+
+            # ray against segment, t along the ray and u along the wall.
+            a = starts[rays]
+            d = directions[rays]
+            q = self.starts[walls]
+            r = self.ends[walls] - q
+            det = d[:, 0] * r[:, 1] - d[:, 1] * r[:, 0]
+            wx = q[:, 0] - a[:, 0]
+            wy = q[:, 1] - a[:, 1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = (wx * r[:, 1] - wy * r[:, 0]) / det
+                u = (wx * d[:, 1] - wy * d[:, 0]) / det
+
+            # only hits in front of the ray, on the segment and before the ray leaves the cell count,
+            # the walls further away come again in one of the next cells.
+            leave = np.minimum(t_next[rays, 0], t_next[rays, 1])
+            ok = (det != 0.) & (t > 1e-9) & (u >= 0.) & (u <= 1.) & (walls != block[rays]) & (t <= leave)
+            t = np.where(ok, t, np.inf)
+            np.minimum.at(best, rays, t)
+            won = ok & (t == best[rays])
+            wall[rays[won]] = walls[won]
+
+            # rays with a hit are done, everything else moves on to the next cell.
+            idx = idx[~np.isfinite(best[idx])]
+            axis = np.argmin(t_next[idx], axis=1)
+            c[idx, axis] += step[idx, axis]
+            t_next[idx, axis] += t_delta[idx, axis]
+            inside = (c[idx] >= 0).all(axis=1) & (c[idx] < self.shape).all(axis=1)
+            idx = idx[inside & (t_next[idx, axis] - t_delta[idx, axis] <= t_out[idx])]
+
+        return wall, best